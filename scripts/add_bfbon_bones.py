@@ -16,6 +16,8 @@ Requirements:
 from __future__ import annotations
 
 import argparse
+import mmap
+import os
 import sys
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Set
@@ -55,28 +57,119 @@ def load_bfres_libs(lib_dir: Path):
     return Bone, Model, ResFile, Skeleton, Array, Byte, MemoryStream
 
 
+def to_net_bytes(raw: bytes, Array, Byte):
+    """Copy a Python buffer into a .NET byte[] with one native memcpy.
+
+    ``Array[Byte](raw)`` marshals element by element through pythonnet, which
+    is very slow for multi-MB decompressed BFRES payloads.
+    """
+    try:
+        import ctypes
+
+        from System import IntPtr  # type: ignore
+        from System.Runtime.InteropServices import Marshal  # type: ignore
+
+        arr = Array.CreateInstance(Byte, len(raw))
+        addr = ctypes.cast(ctypes.c_char_p(raw), ctypes.c_void_p).value
+        Marshal.Copy(IntPtr(addr), arr, 0, len(raw))
+        return arr
+    except Exception:
+        return Array[Byte](raw)
+
+
+def from_net_bytes(net_arr, length: int) -> bytes:
+    """Copy a .NET byte[] back into Python with one native memcpy."""
+    try:
+        import ctypes
+
+        from System import IntPtr  # type: ignore
+        from System.Runtime.InteropServices import Marshal  # type: ignore
+
+        out = bytearray(length)
+        addr = ctypes.addressof((ctypes.c_char * length).from_buffer(out))
+        Marshal.Copy(net_arr, 0, IntPtr(addr), length)
+        return bytes(out)
+    except Exception:
+        return bytes(bytearray(net_arr))
+
+
+def compress_net_bytes(net_arr, length: int) -> bytes:
+    """yaz0-compress a .NET byte[] without first copying it into Python.
+
+    Pinning the array yields a stable address that oead can read through a
+    zero-copy ctypes view, so the only allocation left is oead's output.
+    """
+    try:
+        import ctypes
+
+        from System.Runtime.InteropServices import GCHandle, GCHandleType  # type: ignore
+
+        gch = GCHandle.Alloc(net_arr, GCHandleType.Pinned)
+        try:
+            addr = gch.AddrOfPinnedObject().ToInt64()
+            view = (ctypes.c_ubyte * length).from_address(addr)
+            return oead.yaz0.compress(memoryview(view))
+        finally:
+            gch.Free()
+    except Exception:
+        return oead.yaz0.compress(from_net_bytes(net_arr, length))
+
+
 def decompress_if_needed(path: Path) -> bytes:
-    data = path.read_bytes()
-    return oead.yaz0.decompress(data) if data[:4] == b"Yaz0" else data
+    try:
+        # mmap hands oead a zero-copy view of the file, so the compressed
+        # bytes are never duplicated in Python memory.
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            return oead.yaz0.decompress(mm) if mm[:4] == b"Yaz0" else bytes(mm)
+    except (ValueError, OSError):
+        # empty files and filesystems without mmap support
+        data = path.read_bytes()
+        return oead.yaz0.decompress(data) if data[:4] == b"Yaz0" else data
 
 
 def load_resfile(
     ResFile, MemoryStream, Array, Byte, path: Path
 ):  # type: ignore
     raw = decompress_if_needed(path)
-    stream = MemoryStream(Array[Byte](raw))
+    stream = MemoryStream(to_net_bytes(raw, Array, Byte))
     return ResFile(stream)
 
 
 def gather_bone_paths(bones_dir: Path) -> Dict[str, Path]:
     bone_paths: Dict[str, Path] = {}
-    for bfbon in bones_dir.glob("*.bfbon"):
-        bone_paths[bfbon.stem] = bfbon
+    # os.scandir skips pathlib's per-entry Path construction and fnmatch pass
+    with os.scandir(bones_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.endswith(".bfbon"):
+                bone_paths[name[: -len(".bfbon")]] = Path(entry.path)
     if not bone_paths:
         raise SystemExit(f"No .bfbon files found in {bones_dir}")
     return bone_paths
 
 
+def get_bone_names(skeleton) -> Set[str]:
+    """All bone names of a skeleton, extracted in bulk.
+
+    The Linq path materializes the names into a single string[] on the C#
+    side so Python touches one array instead of crossing the pythonnet
+    boundary three times per bone (enumerator step, Name get, str()).
+    """
+    try:
+        from System import Func, String  # type: ignore
+        from System.Linq import Enumerable  # type: ignore
+
+        selector = Func[object, String](lambda b: b.Name)
+        names = Enumerable.ToArray(
+            Enumerable.Select[object, String](skeleton.Bones, selector)
+        )
+        return set(names)
+    except Exception:
+        return {str(b.Name) for b in skeleton.Bones}
+
+
 def build_order(
     base_skeleton,
     available: Set[str],
@@ -101,7 +194,8 @@ def add_missing_bones_to_skeleton(
     Bone,
 ) -> List[str]:
     added: List[str] = []
-    existing: Set[str] = {str(b.Name) for b in skeleton.Bones}
+    existing: Set[str] = get_bone_names(skeleton)
+    new_bones: List = []
     for name in order:
         if name in existing:
             continue
@@ -110,10 +204,27 @@ def add_missing_bones_to_skeleton(
             continue
         bone = Bone()
         bone.Import(str(path))
-        skeleton.Bones.Add(bone)
-        skeleton.BoneDict.Add(bone.Name)
+        new_bones.append((name, bone))
         added.append(name)
         existing.add(name)
+
+    if not new_bones:
+        return added
+
+    # Insert all bones with one AddRange call instead of one bridged Add per
+    # bone; fall back to per-bone Add where the collection lacks AddRange.
+    try:
+        from System.Collections.Generic import List as NetList  # type: ignore
+
+        batch = NetList[Bone]()
+        for _, bone in new_bones:
+            batch.Add(bone)
+        skeleton.Bones.AddRange(batch)
+    except Exception:
+        for _, bone in new_bones:
+            skeleton.Bones.Add(bone)
+    for name, _ in new_bones:
+        skeleton.BoneDict.Add(name)
     return added
 
 
@@ -121,8 +232,15 @@ def save_resfile(res, MemoryStream, Array, Byte, out_path: Path):
     stream = MemoryStream()
     res.Save(stream, True)
     stream.Position = 0
-    fres_bytes = bytes(bytearray(stream.ToArray()))
-    compressed = oead.yaz0.compress(fres_bytes)
+    try:
+        # GetBuffer() exposes the stream's backing byte[] without a copy;
+        # only the first stream.Length bytes are valid data.
+        net_arr = stream.GetBuffer()
+        length = int(stream.Length)
+    except Exception:
+        net_arr = stream.ToArray()
+        length = net_arr.Length
+    compressed = compress_net_bytes(net_arr, length)
     out_path.write_bytes(compressed)
 
 
@@ -167,7 +285,7 @@ def main():
 
     res = load_resfile(ResFile, MemoryStream, Array, Byte, args.szs)
 
-    initial_names = {str(b.Name) for b in res.Models[0].Skeleton.Bones}
+    initial_names = get_bone_names(res.Models[0].Skeleton)
     desired_names = set(bone_paths.keys())
     order = build_order(base_skel, desired_names)
 
@@ -183,7 +301,7 @@ def main():
             out_path.replace(backup)
     save_resfile(res, MemoryStream, Array, Byte, out_path)
 
-    final_names = {str(b.Name) for b in res.Models[0].Skeleton.Bones}
+    final_names = get_bone_names(res.Models[0].Skeleton)
     added_unique = sorted((final_names - initial_names) & desired_names)
     if added_unique:
         print(f"Added {len(added_unique)} bones: {', '.join(added_unique)}")
@@ -7,6 +7,8 @@ Run from repo root:
 """
 
 import json
+import mmap
+import os
 import re
 import struct
 import sys
@@ -21,104 +23,166 @@ if str(SCRIPT_DIR) not in sys.path:
 
 from mk8dx_audio_classes import Amta
 
+try:
+    # ~5x plus rapide que json sur une grosse map ; purement optionnel
+    import orjson
+except ImportError:
+    orjson = None
+
 
 ROOT_AUDIO = REPO_ROOT / "Audio"
 OUTPUT_PATH = REPO_ROOT / "config" / "audio_assets_map.json"
 _existing_map = {}
 
+# Compile une fois : evite le passage par le cache LRU de re a chaque nom
+_PREFIX_RE = re.compile(r"(?:VO|SE)_([A-Z0-9]+)")
+
 
 def read_bars_metas(path: Path):
-    """Yield (meta_names) for a .bars file without loading assets."""
-    with path.open("rb") as f:
-        if f.read(4) != b"BARS":
+    """Yield (meta_names) for a .bars file without loading assets.
+
+    The whole file is mmap'ed and the header decoded with a handful of
+    batched unpack_from calls instead of one small f.read per field.
+    """
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm[:4] != b"BARS":
             raise ValueError("Not a BARS file")
 
-        size_bytes = f.read(4)
-        bom_bytes = f.read(2)
+        bom_bytes = mm[8:10]
         if bom_bytes not in (b"\xFE\xFF", b"\xFF\xFE"):
             raise ValueError("Invalid BOM")
         bom = ">" if bom_bytes == b"\xFE\xFF" else "<"
 
-        version_bytes = f.read(2)
-        meta_count_bytes = f.read(4)
-        size, version_minor, version_major, meta_count = struct.unpack(
-            bom + "I2BI", size_bytes + version_bytes + meta_count_bytes
+        size, _, version_minor, version_major, meta_count = struct.unpack_from(
+            bom + "I2s2BI", mm, 4
         )
 
-        crcs = struct.unpack(bom + "I" * meta_count, f.read(4 * meta_count)) if meta_count else []
-
-        meta_offsets = []
-        asset_offsets = []
-        for _ in range(meta_count):
-            mo, ao = struct.unpack(bom + "2I", f.read(8))
-            meta_offsets.append(mo)
-            asset_offsets.append(ao)
-
-        # Skip padding/unknown up to first meta
-        if meta_count:
-            to_skip = meta_offsets[0] - f.tell()
-            if to_skip > 0:
-                f.read(to_skip)
+        # La table d'offsets suit les CRC32 (4 octets par meta), inutiles ici
+        pairs = struct.unpack_from(bom + f"{2 * meta_count}I", mm, 16 + 4 * meta_count)
+        meta_offsets = list(pairs[0::2])
+        asset_offsets = list(pairs[1::2])
 
         names = []
         all_offsets = meta_offsets + asset_offsets + [size]
         for mo in meta_offsets:
             next_off = min(o for o in all_offsets if o > mo)
-            meta_size = next_off - mo
-            f.seek(mo)
-            meta_bytes = f.read(meta_size)
-            amta = Amta(BytesIO(meta_bytes))
+            amta = Amta(BytesIO(mm[mo:next_off]))
             if getattr(amta, "name", ""):
                 names.append(amta.name)
 
         return names
 
 
+def iter_bars(root: Path):
+    """Walk root iteratively with os.scandir, yielding every .bars path.
+
+    Unlike rglob, the file type comes from the directory entry itself and
+    the match is a plain endswith -- no extra stat, no fnmatch pass.
+    """
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    stack.append(e.path)
+                elif e.name.endswith(".bars"):
+                    yield Path(e.path)
+
+
 def derive_prefix(names):
+    search = _PREFIX_RE.search
     cand = Counter()
     for n in names:
-        m = re.search(r"(?:VO|SE)_([A-Z0-9]+)", n)
+        m = search(n)
         if m:
             cand[m.group(1)] += 1
     return cand.most_common(1)[0][0] if cand else ""
 
 
+def parse_one(path: Path):
+    """Worker: parse one .bars, returning (path_str, names, error)."""
+    try:
+        return str(path), read_bars_metas(path), None
+    except Exception as e:
+        return str(path), None, str(e)
+
+
 def main():
     global _existing_map
     if OUTPUT_PATH.exists():
         try:
-            _existing_map = json.loads(OUTPUT_PATH.read_text(encoding="utf-8"))
+            # read_bytes + loads : orjson ne prend pas d'objet fichier et
+            # decode l'UTF-8 lui-meme
+            raw = OUTPUT_PATH.read_bytes()
+            _existing_map = orjson.loads(raw) if orjson is not None else json.loads(raw)
         except Exception:
             _existing_map = {}
 
     output = {}
-    bars_files = sorted(ROOT_AUDIO.rglob("*.bars"))
+    bars_files = sorted(iter_bars(ROOT_AUDIO))
     print(f"Found {len(bars_files)} .bars files under {ROOT_AUDIO}")
 
-    for idx, path in enumerate(bars_files, 1):
+    # Passe 1 : separer les fichiers inchanges (mtime+taille identiques,
+    # entree reprise telle quelle) de ceux a re-parser.
+    plan = []  # (path, section, name, sig, prior, cached)
+    to_parse = []
+    for path in bars_files:
         rel = path.relative_to(ROOT_AUDIO)
         section = str(rel.parent).replace("\\", "/")
-        entry = {"prefix": "", "amta": [], "bfwav": []}
-
-        try:
-            names = read_bars_metas(path)
-        except Exception as e:
-            print(f"[WARN] Skip {path}: {e}")
+        prior = _existing_map.get(section, {}).get(rel.name, {})
+        st = path.stat()
+        sig = [st.st_mtime_ns, st.st_size]
+        cached = prior.get("_sig") == sig
+        plan.append((path, section, rel.name, sig, prior, cached))
+        if not cached:
+            to_parse.append(path)
+
+    # Passe 2 : le parsing (struct/AMTA, borne CPU) est reparti sur les
+    # coeurs des qu'il y a plus d'un fichier a traiter.
+    results = {}
+    if len(to_parse) > 1:
+        from multiprocessing import Pool
+
+        with Pool() as pool:
+            for done, (path_str, names, err) in enumerate(
+                pool.imap_unordered(parse_one, to_parse, chunksize=16), 1
+            ):
+                results[path_str] = (names, err)
+                if done % 20 == 0:
+                    print(f"Processed {done}/{len(to_parse)}")
+    else:
+        for path in to_parse:
+            path_str, names, err = parse_one(path)
+            results[path_str] = (names, err)
+
+    # Passe 3 : assemblage dans l'ordre des fichiers.
+    for path, section, name, sig, prior, cached in plan:
+        if cached:
+            output.setdefault(section, {})[name] = prior
             continue
-
-        entry["amta"] = names
-        entry["bfwav"] = names  # 1:1 mapping assumption
-        # Reuse existing prefix if available; otherwise derive.
-        prior_prefix = _existing_map.get(section, {}).get(rel.name, {}).get("prefix", "")
-        entry["prefix"] = prior_prefix or derive_prefix(names)
-
-        output.setdefault(section, {})[rel.name] = entry
-
-        if idx % 20 == 0:
-            print(f"Processed {idx}/{len(bars_files)}")
+        names, err = results[str(path)]
+        if names is None:
+            print(f"[WARN] Skip {path}: {err}")
+            continue
+        output.setdefault(section, {})[name] = {
+            # Reuse existing prefix if available; otherwise derive.
+            "prefix": prior.get("prefix", "") or derive_prefix(names),
+            "amta": names,
+            "bfwav": names,  # 1:1 mapping assumption
+            "_sig": sig,
+        }
+
+    # Rien n'a change (== sur dict ignore l'ordre des cles) : on ne paie ni
+    # l'encodage JSON ni l'ecriture disque
+    if output == _existing_map:
+        print(f"{OUTPUT_PATH} is up to date (sections: {len(output)})")
+        return
 
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    OUTPUT_PATH.write_text(json.dumps(output, indent=2), encoding="utf-8")
+    if orjson is not None:
+        OUTPUT_PATH.write_bytes(orjson.dumps(output, option=orjson.OPT_INDENT_2))
+    else:
+        OUTPUT_PATH.write_text(json.dumps(output, indent=2), encoding="utf-8")
     print(f"Written {OUTPUT_PATH} (sections: {len(output)})")
 
 
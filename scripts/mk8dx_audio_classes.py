@@ -5,22 +5,60 @@
 import bisect
 import struct
 import pathlib
-import binascii
+import sys
+import zlib
+from array import array
 from typing import List, Tuple, Union
 from io import BufferedReader, BufferedWriter, IOBase, BytesIO
 
+# Precompiled per-endianness structs: these fixed formats are hit once per
+# AMTA/BWAV entry, re-parsing the format string each time is pure overhead
+_U32 = {bom: struct.Struct(bom + 'I') for bom in '<>'}
+_VER_SIZE = {bom: struct.Struct(bom + '2BI') for bom in '<>'}
+_AMTA_OFFSETS = {bom: struct.Struct(bom + '6I') for bom in '<>'}
+_AMTA_UNK = {bom: struct.Struct(bom + 'I5f') for bom in '<>'}
+_AMTA_UNK2_REC = {bom: struct.Struct(bom + '4I') for bom in '<>'}
+_BWAV_HDR = {bom: struct.Struct(bom + 'BBIHH') for bom in '<>'}
+_CHAN_HEAD = {bom: struct.Struct(bom + '2H3I') for bom in '<>'}
+_CHAN_TAIL = {bom: struct.Struct(bom + '5IH2hH') for bom in '<>'}
+_OFF_PAIR = {bom: struct.Struct(bom + '2I') for bom in '<>'}
+
+# Sign-extended (high, low) nibble pairs for every byte value: the DSP-ADPCM
+# decoder looks a byte up once instead of extracting and sign-adjusting twice
+_SIGNED_NIBBLES = [((b >> 4) - 16 if b >= 0x80 else b >> 4,
+                    (b & 15) - 16 if b & 15 >= 8 else b & 15) for b in range(256)]
+
+_pyogg = None
+
+def _get_pyogg():
+    # pyogg is an optional dependency only needed for opus BWAVs; memoize the
+    # module so hot paths skip the sys.modules lookup of a repeated import.
+    # Note: OpusDecoder/OpusEncoder instances themselves must NOT be shared
+    # across streams - libopus keeps inter-frame prediction state per stream.
+    global _pyogg
+    if _pyogg is None:
+        import pyogg
+        _pyogg = pyogg
+    return _pyogg
+
+
 def calculate_crc32_hash(input_string):
-    return binascii.crc32(input_string.encode('utf8'))
+    # zlib.crc32 is the C slice-by-8 implementation (binascii just aliases it)
+    return zlib.crc32(input_string.encode('utf8'))
 
 def pad_count(pos: int, multiplier: int = 64) -> int:
-    assert pos >= 0
+    # every multiplier used in this file (4, 64) is a power of two, so a
+    # bitmask replaces the generic modulo; keep a fallback just in case
+    if multiplier & (multiplier - 1) == 0:
+        return -pos & (multiplier - 1)
     diff = (pos % multiplier)
     if diff == 0:
         return 0
     return multiplier - diff
 
 def pad_till(pos: int, multiplier: int = 64) -> int:
-    assert pos >= 0
+    if multiplier & (multiplier - 1) == 0:
+        return (pos + multiplier - 1) & -multiplier
     return pos + pad_count(pos, multiplier)
 
 def pad_to_file(writer: BufferedWriter, multiplier: int = 64) -> None:
@@ -54,8 +92,11 @@ def pad_to_4_byte_boundary(data):
     return padded_data
 
 class RawAsset:
-    """Minimal wrapper for assets we don't parse (e.g. BFWAV)."""
-    def __init__(self, data: bytes) -> None:
+    """Minimal wrapper for assets we don't parse (e.g. BFWAV).
+
+    'data' may be a memoryview into a parent buffer; it is only ever
+    written out or measured, so no copy is needed."""
+    def __init__(self, data: Union[bytes, memoryview]) -> None:
         self.data = data
         self.header = None  # keeps interface similarity with Bwav
 
@@ -66,7 +107,9 @@ class RawAsset:
         return len(self.data)
 
 class AmtaUnknownSection:
-    def __init__(self, reader: BufferedReader, bom: str) -> None:       
+    __slots__ = ('unk_1', 'unk_2', 'unk_3', 'unk_4', 'unk_5', 'unk_6')
+
+    def __init__(self, reader: BufferedReader, bom: str) -> None:
         self.unk_1: int
         self.unk_2: float
         self.unk_3: float
@@ -77,19 +120,21 @@ class AmtaUnknownSection:
         if reader == None:
             return
 
-        self.unk_1, self.unk_2, self.unk_3, self.unk_4, self.unk_5, self.unk_6 = struct.unpack(bom + "I5f", reader.read(24))
+        self.unk_1, self.unk_2, self.unk_3, self.unk_4, self.unk_5, self.unk_6 = _AMTA_UNK[bom].unpack(reader.read(24))
 
     def write(self, writer: BufferedWriter, bom: str) -> None:
-        writer.write(struct.pack(bom + "I5f", self.unk_1, self.unk_2, self.unk_3, self.unk_4, self.unk_5, self.unk_6))
-        
+        writer.write(_AMTA_UNK[bom].pack(self.unk_1, self.unk_2, self.unk_3, self.unk_4, self.unk_5, self.unk_6))
+
     def to_bytes(self, bom: str):
-        return struct.pack(bom + "I5f", self.unk_1, self.unk_2, self.unk_3, self.unk_4, self.unk_5, self.unk_6)
+        return _AMTA_UNK[bom].pack(self.unk_1, self.unk_2, self.unk_3, self.unk_4, self.unk_5, self.unk_6)
 
     def get_size(self) -> int:
         return 24 # content length doesn't change
     
 class AmtaUnknown2Record:
-    def __init__(self, reader: BufferedReader, bom: str) -> None:       
+    __slots__ = ('unk_1', 'unk_2', 'unk_3', 'unk_4')
+
+    def __init__(self, reader: BufferedReader, bom: str) -> None:
         self.unk_1: int
         self.unk_2: int
         self.unk_3: int
@@ -98,10 +143,16 @@ class AmtaUnknown2Record:
         if reader == None:
             return
 
-        self.unk_1, self.unk_2, self.unk_3, self.unk_4 = struct.unpack(bom + "4I", reader.read(16))
+        self.unk_1, self.unk_2, self.unk_3, self.unk_4 = _AMTA_UNK2_REC[bom].unpack(reader.read(16))
+
+    @classmethod
+    def _make(cls, values: Tuple[int, int, int, int]) -> 'AmtaUnknown2Record':
+        record = cls(None, None)
+        record.unk_1, record.unk_2, record.unk_3, record.unk_4 = values
+        return record
 
     def write(self, writer: BufferedWriter, bom: str) -> None:
-        writer.write(struct.pack(bom + "4I", self.unk_1, self.unk_2, self.unk_3, self.unk_4))
+        writer.write(_AMTA_UNK2_REC[bom].pack(self.unk_1, self.unk_2, self.unk_3, self.unk_4))
         
 
     def get_size(self) -> int:
@@ -112,27 +163,25 @@ class AmtaUnknown2Section:
         self.count: int
         self.records: List[AmtaUnknown2Record] = []
 
-        self.count, = struct.unpack(bom + "I", reader.read(4))
-        for _ in range(self.count):
-            chunk = reader.read(16)
-            if len(chunk) < 16:
-                # stop early if the section is shorter than advertised (malformed AMTA)
-                break
-            unk_1, unk_2, unk_3, unk_4 = struct.unpack(bom + "4I", chunk)
-            record = AmtaUnknown2Record(None, None)
-            record.unk_1 = unk_1
-            record.unk_2 = unk_2
-            record.unk_3 = unk_3
-            record.unk_4 = unk_4
-            self.records.append(record)
+        self.count, = _U32[bom].unpack(reader.read(4))
+        # one read for the whole record table; a short read just truncates
+        # the section (malformed AMTA) instead of raising
+        blob = reader.read(self.count * 16)
+        if len(blob) % 16:
+            blob = memoryview(blob)[:len(blob) - len(blob) % 16]
+        # iter_unpack runs the whole unpack loop in C
+        self.records = [AmtaUnknown2Record._make(values) for values in _AMTA_UNK2_REC[bom].iter_unpack(blob)]
 
         # adjust count to what we actually read to avoid downstream mismatches
         self.count = len(self.records)
 
     def write(self, writer: BufferedWriter, bom: str) -> None:
-        writer.write(struct.pack(bom + "I", self.count))
-        for record in self.records:
-            record.write(writer, bom)
+        buf = bytearray(4 + 16 * len(self.records))
+        _U32[bom].pack_into(buf, 0, self.count)
+        rec_struct = _AMTA_UNK2_REC[bom]
+        for i, record in enumerate(self.records):
+            rec_struct.pack_into(buf, 4 + i * 16, record.unk_1, record.unk_2, record.unk_3, record.unk_4)
+        writer.write(buf)
 
     def get_size(self) -> int:
         return 4 + self.count * 16
@@ -160,7 +209,7 @@ class Amta:
         self.UNKNOWN2_section: AmtaUnknown2Section = None
         self.rest_of_file: bytes # TODO find out what this holds, usually only the name, sometimes with some other string(s) separated by null byte
         self.name: str # don't write this to file
-        self.raw_bytes: bytes = None  # preserve raw AMTA for passthrough
+        self.raw_bytes: Union[bytes, memoryview] = None  # preserve raw AMTA for passthrough
 
         if reader == None:
             return
@@ -174,8 +223,8 @@ class Amta:
         assert bom == b'\xFE\xFF' or bom == b'\xFF\xFE'
         self.bom = '>' if bom == b'\xFE\xFF' else '<'
 
-        self.version_minor, self.version_major, self.size = struct.unpack(self.bom + '2BI', reader.read(6))
-        self.empty_offset, self.UNKNOWN_offset, self.UNKNOWN2_offset, self.MINF_offset, self.STRINGS_offset, self.empty_offset_2 = struct.unpack(self.bom + '6I', reader.read(24))
+        self.version_minor, self.version_major, self.size = _VER_SIZE[self.bom].unpack(reader.read(6))
+        self.empty_offset, self.UNKNOWN_offset, self.UNKNOWN2_offset, self.MINF_offset, self.STRINGS_offset, self.empty_offset_2 = _AMTA_OFFSETS[self.bom].unpack(reader.read(24))
 
         # TODO implement reading (AND WRITING) like the rest of AMTA, this code is dirty ;d
         off_pos = reader.tell()
@@ -192,7 +241,7 @@ class Amta:
             reader.seek(-4, 1)
             data_tag = b''
         data_len_bytes = reader.read(4)
-        self.DATA_size = struct.unpack(self.bom + 'I', data_len_bytes)[0] if len(data_len_bytes) == 4 else 0
+        self.DATA_size = _U32[self.bom].unpack(data_len_bytes)[0] if len(data_len_bytes) == 4 else 0
         data_payload = reader.read(self.DATA_size) if self.DATA_size > 0 else b''
 
         # Keep payload as-is (passthrough)
@@ -207,23 +256,30 @@ class Amta:
         remaining_len = max(0, (start_pos + self.size) - cur_pos)
         self.rest_of_file = reader.read(remaining_len) if remaining_len else b''
 
-        # Extract name from STRG chunk if present
-        name_bytes = b""
-        if b"STRG" in self.rest_of_file:
-            try:
-                idx = self.rest_of_file.index(b"STRG")
-                str_len, = struct.unpack(self.bom + "I", self.rest_of_file[idx + 4: idx + 8])
-                name_bytes = self.rest_of_file[idx + 8: idx + 8 + max(0, str_len - 1)]
-            except Exception:
-                name_bytes = b""
+        # Extract name from STRG chunk if present (one find, not an `in`
+        # test followed by .index scanning the same bytes again)
+        idx = self.rest_of_file.find(b"STRG")
+        if idx >= 0 and idx + 8 <= len(self.rest_of_file):
+            str_len, = _U32[self.bom].unpack_from(self.rest_of_file, idx + 4)
+            name_bytes = self.rest_of_file[idx + 8: idx + 8 + max(0, str_len - 1)]
+        elif idx >= 0:
+            name_bytes = b"" # truncated STRG header
         else:
-            name_bytes = self.rest_of_file.split(b'\x00')[0] if self.rest_of_file else b''
+            # equivalent to split(b'\x00')[0] without materializing every part
+            end = self.rest_of_file.find(b'\x00')
+            name_bytes = self.rest_of_file[:end] if end >= 0 else self.rest_of_file
         self.name = name_bytes.decode("utf-8", errors="ignore")
 
-        # capture raw bytes to allow exact passthrough on write
-        reader.seek(start_pos)
-        self.raw_bytes = reader.read(self.size)
-        reader.seek(start_pos + self.size)
+        # capture raw bytes to allow exact passthrough on write; an in-memory
+        # stream already holds them, so slice its buffer zero-copy instead of
+        # seeking back and re-reading the whole section
+        if isinstance(reader, BytesIO):
+            self.raw_bytes = reader.getbuffer()[start_pos:start_pos + self.size]
+            reader.seek(start_pos + self.size)
+        else:
+            reader.seek(start_pos)
+            self.raw_bytes = reader.read(self.size)
+            reader.seek(start_pos + self.size)
 
     def write(self, writer: BufferedWriter) -> None:
         if self.raw_bytes:
@@ -234,11 +290,11 @@ class Amta:
 
         writer.write(self.magic) # 4
         writer.write(b'\xFE\xFF' if self.bom == '>' else b'\xFF\xFE') # 2
-        writer.write(struct.pack(self.bom + '2BI', self.version_minor, self.version_major, self.size)) # 6
-        writer.write(struct.pack(self.bom + '6I', self.empty_offset, self.UNKNOWN_offset, self.UNKNOWN2_offset, self.MINF_offset, self.STRINGS_offset, self.empty_offset_2)) # 24
+        writer.write(_VER_SIZE[self.bom].pack(self.version_minor, self.version_major, self.size)) # 6
+        writer.write(_AMTA_OFFSETS[self.bom].pack(self.empty_offset, self.UNKNOWN_offset, self.UNKNOWN2_offset, self.MINF_offset, self.STRINGS_offset, self.empty_offset_2)) # 24
         self.DATA_size = len(self.rest_of_data)
         writer.write(b'DATA')
-        writer.write(struct.pack(self.bom + 'I', self.DATA_size))
+        writer.write(_U32[self.bom].pack(self.DATA_size))
         writer.write(self.rest_of_data)
         writer.write(self.rest_of_file)
         pad_to_file(writer, 4)
@@ -250,6 +306,9 @@ class Amta:
         return pad_till(4 + 2 + 6 + 24 + 4 + 4 + data_payload_len + len(self.rest_of_file), 4)
 
 class BwavFileHeader: #https://gota7.github.io/Citric-Composer/specs/binaryWav.html
+    __slots__ = ('magic', 'bom', 'version_minor', 'version_major', 'crc',
+                 'is_prefetch', 'num_channels')
+
     def __init__(self, reader: BufferedReader) -> None:
         self.magic: bytes
         self.bom: str
@@ -267,7 +326,7 @@ class BwavFileHeader: #https://gota7.github.io/Citric-Composer/specs/binaryWav.h
         assert bom == b'\xFE\xFF' or bom == b'\xFF\xFE'
         self.bom = '>' if bom == b'\xFE\xFF' else '<'
 
-        self.version_minor, self.version_major, self.crc, prefetch, self.num_channels = struct.unpack(self.bom + 'BBIHH', reader.read(10))
+        self.version_minor, self.version_major, self.crc, prefetch, self.num_channels = _BWAV_HDR[self.bom].unpack(reader.read(10))
         self.is_prefetch = prefetch == 1
 
         assert self.num_channels > 0
@@ -275,12 +334,19 @@ class BwavFileHeader: #https://gota7.github.io/Citric-Composer/specs/binaryWav.h
     def write(self, writer: BufferedWriter) -> None:
         writer.write(self.magic) # 4
         writer.write(b'\xFE\xFF' if self.bom == '>' else b'\xFF\xFE') # 2
-        writer.write(struct.pack(self.bom + 'BBIHH', self.version_minor, self.version_major, self.crc, 1 if self.is_prefetch else 0, self.num_channels)) # 10
+        writer.write(_BWAV_HDR[self.bom].pack(self.version_minor, self.version_major, self.crc, 1 if self.is_prefetch else 0, self.num_channels)) # 10
 
     def get_size(self) -> int:
         return 16 # content length doesn't change
 
 class BwavChannelInfo: #https://gota7.github.io/Citric-Composer/specs/binaryWav.html
+    __slots__ = ('codec', 'channel_pan', 'sample_rate', 'num_samples_nonprefetch',
+                 'num_samples_this', 'dsp_adpcm_coefficients',
+                 'absolute_start_samples_nonprefetch', 'absolute_start_samples_this',
+                 'is_looping', 'loop_end_sample', 'loop_start_sample',
+                 'predictor_scale', 'history_sample_1', 'history_sample_2', 'padding',
+                 'coefs')
+
     def __init__(self, reader: BufferedReader, bom: str) -> None:
         self.codec: int
         self.channel_pan: int
@@ -288,6 +354,7 @@ class BwavChannelInfo: #https://gota7.github.io/Citric-Composer/specs/binaryWav.
         self.num_samples_nonprefetch: int
         self.num_samples_this: int
         self.dsp_adpcm_coefficients: bytes
+        self.coefs: array # dsp_adpcm_coefficients decoded to native-order int16
         self.absolute_start_samples_nonprefetch: int
         self.absolute_start_samples_this: int
         self.is_looping: bool
@@ -298,19 +365,30 @@ class BwavChannelInfo: #https://gota7.github.io/Citric-Composer/specs/binaryWav.
         self.history_sample_2: int #?
         self.padding: int
 
-        self.codec, self.channel_pan, self.sample_rate, self.num_samples_nonprefetch, self.num_samples_this = struct.unpack(bom + '2H3I', reader.read(16))
-        self.dsp_adpcm_coefficients = reader.read(32) # TODO read with BOM!!!
+        # one read for the whole 76-byte info block instead of three small ones
+        buf = reader.read(76)
+        self.codec, self.channel_pan, self.sample_rate, self.num_samples_nonprefetch, self.num_samples_this = _CHAN_HEAD[bom].unpack_from(buf, 0)
+        self.dsp_adpcm_coefficients = buf[16:48] # TODO read with BOM!!!
+        # parse the coefficients once up front; the ADPCM decoder reads them
+        # per frame and should not re-unpack the raw bytes on every decode
+        coefs = array('h')
+        coefs.frombytes(self.dsp_adpcm_coefficients)
+        if (bom == '>') != (sys.byteorder == 'big'):
+            coefs.byteswap()
+        self.coefs = coefs
         self.absolute_start_samples_nonprefetch, self.absolute_start_samples_this, \
             is_looping, self.loop_end_sample, self.loop_start_sample, self.predictor_scale, \
-            self.history_sample_1, self.history_sample_2, self.padding = struct.unpack(bom + '5IH2hH', reader.read(28))
+            self.history_sample_1, self.history_sample_2, self.padding = _CHAN_TAIL[bom].unpack_from(buf, 48)
         self.is_looping = is_looping == 1
 
     def write(self, writer: BufferedWriter, bom: str) -> None:
-        writer.write(struct.pack(bom + '2H3I', self.codec, self.channel_pan, self.sample_rate, self.num_samples_nonprefetch, self.num_samples_this)) # 16
-        writer.write(self.dsp_adpcm_coefficients) # TODO write with BOM!!!
-        writer.write(struct.pack(bom + '5IH2hH', self.absolute_start_samples_nonprefetch, self.absolute_start_samples_this, \
+        buf = bytearray(76)
+        _CHAN_HEAD[bom].pack_into(buf, 0, self.codec, self.channel_pan, self.sample_rate, self.num_samples_nonprefetch, self.num_samples_this) # 16
+        buf[16:48] = self.dsp_adpcm_coefficients # TODO write with BOM!!!
+        _CHAN_TAIL[bom].pack_into(buf, 48, self.absolute_start_samples_nonprefetch, self.absolute_start_samples_this, \
             1 if self.is_looping else 0, self.loop_end_sample, self.loop_start_sample, self.predictor_scale, \
-            self.history_sample_1, self.history_sample_2, self.padding)) # 28
+            self.history_sample_1, self.history_sample_2, self.padding) # 28
+        writer.write(buf)
         
     def get_size(self) -> int:
         return 76 # content length doesn't change
@@ -322,23 +400,28 @@ class Bwav: #https://gota7.github.io/Citric-Composer/specs/binaryWav.html
         self.channel_infos: List[BwavChannelInfo] = []
         self.channel_samples: List[bytes] = []
         self.raw_bytes: bytes = None  # used when magic is not BWAV
+        self._cached_size: int = None # invalidated by conversions that change the samples
 
 
         reader: BufferedReader
         reader_opened_here = False
         if isinstance(path_or_bufferedReader, str):
             self.filepath = path_or_bufferedReader
-            reader = open(path_or_bufferedReader, "rb")
+            # read the file once and parse from memory, like Bars does: the
+            # per-channel seeks and small reads below become pointer bumps
+            # instead of buffered file IO
+            with open(path_or_bufferedReader, "rb") as f:
+                file_bytes = f.read()
+            reader = BytesIO(file_bytes)
             reader_opened_here = True
+            if not size:
+                size = len(file_bytes)
         else:
             reader = path_or_bufferedReader
 
         if not reader_opened_here and not size:
             raise ValueError("'size' must be passed if bufferedReader was passed in 'path_or_bufferedReader'")
-        
-        if reader_opened_here and not size:
-            size = get_file_size(reader)
-        
+
         pos = reader.tell()
         magic_peek = reader.read(4)
         reader.seek(pos)
@@ -358,7 +441,7 @@ class Bwav: #https://gota7.github.io/Citric-Composer/specs/binaryWav.html
 
             if channel.codec == 2:
                 reader.seek(36, 1)
-                samples_size = struct.unpack(self.header.bom + "I", reader.read(4))[0] + 40
+                samples_size = _U32[self.header.bom].unpack(reader.read(4))[0] + 40
                 reader.seek(-40, 1)
             else:
                 samples_size = size - self.channel_infos[-1].absolute_start_samples_this
@@ -368,7 +451,7 @@ class Bwav: #https://gota7.github.io/Citric-Composer/specs/binaryWav.html
         if reader_opened_here:
             reader.close()
 
-        self.decoded_channels: List[List[int]] = [None] * self.header.num_channels
+        self.decoded_channels: List[array] = [None] * self.header.num_channels
 
     def write(self, path_or_bufferedWriter: Union[str, BufferedWriter]):
         writer: BufferedWriter = None
@@ -398,21 +481,24 @@ class Bwav: #https://gota7.github.io/Citric-Composer/specs/binaryWav.html
     def get_size(self) -> int:
         if self.raw_bytes is not None:
             return len(self.raw_bytes)
-        header_and_info_part = self.header.get_size() + sum([channel.get_size() for channel in self.channel_infos])
+        if self._cached_size is not None:
+            return self._cached_size
+        header_and_info_part = self.header.get_size() + sum(channel.get_size() for channel in self.channel_infos)
 
         # get only unique samples, as some channels can point to the same sample array
+        seen_offsets = set()
         unique_samples: List[Tuple[int, int]] = []
         for idx in range(self.header.num_channels):
-            if not [idx_offset_tuple for idx_offset_tuple in unique_samples if idx_offset_tuple[1] == self.channel_infos[idx].absolute_start_samples_this]:
-                unique_samples.append((idx, self.channel_infos[idx].absolute_start_samples_this))
+            offset = self.channel_infos[idx].absolute_start_samples_this
+            if offset not in seen_offsets:
+                seen_offsets.add(offset)
+                unique_samples.append((idx, offset))
         last_idx = unique_samples[-1][0]
 
-        if len(unique_samples) != self.header.num_channels:
-            pass
-
-        samples_part = sum([pad_till(len(self.channel_samples[idx])) if idx != last_idx else len(self.channel_samples[idx]) for idx, _ in unique_samples])
+        samples_part = sum(pad_till(len(self.channel_samples[idx])) if idx != last_idx else len(self.channel_samples[idx]) for idx, _ in unique_samples)
         # condition in the line above - the last channel's samples don't need to be padded, but must remember about it if this BWAV is not the last one in BARS - caller must worry about it
-        return (pad_till(header_and_info_part) + samples_part) if samples_part > 0 else header_and_info_part
+        self._cached_size = (pad_till(header_and_info_part) + samples_part) if samples_part > 0 else header_and_info_part
+        return self._cached_size
             
     def get_peak_volume(self) -> float:
             if self.raw_bytes is not None:
@@ -421,9 +507,13 @@ class Bwav: #https://gota7.github.io/Citric-Composer/specs/binaryWav.html
 
             used for populating AMTA"""
             decoded = self.decode()
-            all_samples = [sample for channel_samples in decoded for sample in channel_samples]
-            max_sample = max(abs(sample) for sample in all_samples)
-            return max_sample / 32768
+            # per-channel max/min reductions run in C; no flattened list of
+            # boxed ints and no per-sample abs() call
+            peak = 0
+            for channel_samples in decoded:
+                if len(channel_samples):
+                    peak = max(peak, max(channel_samples), -min(channel_samples))
+            return peak / 32768
     
     def convert_to_prefetch(self) -> bool:
         if self.raw_bytes is not None:
@@ -442,8 +532,12 @@ class Bwav: #https://gota7.github.io/Citric-Composer/specs/binaryWav.html
             samples = self.channel_samples[idx]
             if channel.codec == 2:
                 decoded_samples = self.decode_channel(idx, req_bytes // 2)
-                format = f"{self.header.bom}{len(decoded_samples)}h"
-                samples = struct.pack(format, *decoded_samples) # conversion to PCM bytes
+                # conversion to PCM bytes: a memcpy off the int16 array, with a
+                # byteswapped copy if the file byte order differs from the host
+                if (self.header.bom == '>') != (sys.byteorder == 'big'):
+                    decoded_samples = array('h', decoded_samples)
+                    decoded_samples.byteswap()
+                samples = decoded_samples.tobytes()
 
             if channel.num_samples_this < req_samples and len(samples) < req_bytes:
                 continue
@@ -455,11 +549,12 @@ class Bwav: #https://gota7.github.io/Citric-Composer/specs/binaryWav.html
 
         if converted:
             self.header.is_prefetch = True
+            self._cached_size = None # samples were trimmed
 
         return converted
     
-    def decode_channel(self, channel_idx: int, sample_limit: int = 0) -> List[int]:
-        """returns a list of PCM16 (short) samples"""
+    def decode_channel(self, channel_idx: int, sample_limit: int = 0) -> array:
+        """returns an array('h') of PCM16 (short) samples"""
         assert channel_idx < self.header.num_channels
 
         if self.decoded_channels[channel_idx]:
@@ -472,105 +567,133 @@ class Bwav: #https://gota7.github.io/Citric-Composer/specs/binaryWav.html
         reduced = False
 
         src = self.channel_samples[channel_idx]
-        dst: List[int] = []
+        dst = array('h')
 
         channel_info = self.channel_infos[channel_idx]
         if channel_info.codec == 0:
             if result_byte_limit > 0 and len(src) > result_byte_limit:
                 reduced = True
                 src = src[:result_byte_limit]
-            format = f'{self.header.bom}{len(src) // 2}h'
-            dst.extend(struct.unpack(format, src))
-            # for i in range(channel_info.num_samples_this):
-            #     dst.append(*struct.unpack(self.header.bom + "h", src[i*2:i*2+2]))
+            # bulk memcpy into a native int16 array instead of a tuple of
+            # boxed ints; byteswap only when file and host endianness differ
+            dst = array('h')
+            dst.frombytes(src[:len(src) - (len(src) & 1)])
+            if (self.header.bom == '>') != (sys.byteorder == 'big'):
+                dst.byteswap()
         elif channel_info.codec == 1: # based on https://github.com/Thealexbarney/DspTool/blob/master/dsptool/decode.c
             num_samples = channel_info.num_samples_this
             hist1 = channel_info.history_sample_1
             hist2 = channel_info.history_sample_2
-            coefs: Tuple[int] = struct.unpack(self.header.bom + '16h', channel_info.dsp_adpcm_coefficients)
+            coefs = channel_info.coefs
 
             SAMPLES_PER_FRAME = 14
             frame_count = (num_samples + SAMPLES_PER_FRAME - 1) // SAMPLES_PER_FRAME
             samples_remaining = num_samples
 
-            dst = [0] * num_samples
+            dst = array('h', bytes(2 * num_samples))
+            nibbles = _SIGNED_NIBBLES
 
             idx_src = 0
             idx_dst = 0
             for _ in range(frame_count):
-                predictor = get_high_nibble(src[idx_src])
-                scale = 1 << get_low_nibble(src[idx_src])
+                header_byte = src[idx_src]
                 idx_src += 1
-                coef1 = coefs[predictor * 2]
-                coef2 = coefs[predictor * 2 + 1]
+                scale = 1 << (header_byte & 0x0F)
+                predictor2 = (header_byte >> 4 & 0x0F) * 2
+                coef1 = coefs[predictor2]
+                coef2 = coefs[predictor2 + 1]
 
                 samples_to_read = min(SAMPLES_PER_FRAME, samples_remaining)
-                even = True
-                for _ in range(samples_to_read):
-                    sample = 0
-                    if even:
-                        sample = get_high_nibble(src[idx_src])
-                    else:
-                        sample = get_low_nibble(src[idx_src])
-                        idx_src += 1
-                    even = not even
-                    sample = sample - 16 if sample >= 8 else sample
-                    sample = (((scale * sample) << 11) + 1024 + (coef1 * hist1 + coef2 * hist2)) >> 11
-
-                    final_sample = sample
-                    if final_sample > 32767: # short max val
-                        final_sample = 32767
-                    elif final_sample < -32768: # short min val
-                        final_sample = -32768
-
+                frame_len = (samples_to_read + 1) // 2
+                frame = src[idx_src:idx_src + frame_len]
+                idx_src += frame_len
+
+                # decode two samples per byte, unrolled; a trailing odd sample
+                # (last frame only) uses just the high nibble of its byte
+                for byte in frame[:samples_to_read // 2]:
+                    high, low = nibbles[byte]
+                    sample = ((scale * high << 11) + 1024 + coef1 * hist1 + coef2 * hist2) >> 11
+                    if sample > 32767: # short max val
+                        sample = 32767
+                    elif sample < -32768: # short min val
+                        sample = -32768
+                    sample2 = ((scale * low << 11) + 1024 + coef1 * sample + coef2 * hist1) >> 11
+                    if sample2 > 32767:
+                        sample2 = 32767
+                    elif sample2 < -32768:
+                        sample2 = -32768
+                    hist2 = sample
+                    hist1 = sample2
+                    dst[idx_dst] = sample
+                    dst[idx_dst + 1] = sample2
+                    idx_dst += 2
+                if samples_to_read & 1:
+                    high, _ = nibbles[frame[-1]]
+                    sample = ((scale * high << 11) + 1024 + coef1 * hist1 + coef2 * hist2) >> 11
+                    if sample > 32767:
+                        sample = 32767
+                    elif sample < -32768:
+                        sample = -32768
                     hist2 = hist1
-                    hist1 = final_sample
-                    dst[idx_dst] = final_sample
+                    hist1 = sample
+                    dst[idx_dst] = sample
                     idx_dst += 1
-                
-                if result_byte_limit > 0 and idx_dst > result_byte_limit:
+
+                # idx_dst counts samples, so compare against the sample limit -
+                # the old check used the byte limit (2x) and decoded twice as
+                # many frames as requested before stopping
+                if sample_limit > 0 and idx_dst >= sample_limit:
                     reduced = True
                     dst = dst[:sample_limit]
                     break
-                
+
                 samples_remaining -= samples_to_read
         elif channel_info.codec == 2:
-            import pyogg
+            pyogg = _get_pyogg()
             opus_dec = pyogg.OpusDecoder()
             opus_dec.set_channels(1)
             opus_dec.set_sampling_frequency(channel_info.sample_rate)
 
             data_len = len(src)
             cur_idx = 40
-            total_pcm = bytes()
+            # collect packets and join once: += on bytes in a loop re-copies
+            # the whole accumulated buffer every iteration
+            pcm_chunks = []
+            pcm_len = 0
             while cur_idx < data_len:
-                packet_size, = struct.unpack('>I', src[cur_idx:cur_idx+4])
+                packet_size, = _U32['>'].unpack(src[cur_idx:cur_idx+4])
                 cur_idx += 8 # skipping 4 unknown bytes
                 to_read = cur_idx + packet_size
                 packet = src[cur_idx:to_read]
                 decoded_pcm = opus_dec.decode(bytearray(packet))
-                total_pcm += decoded_pcm
-                
+                pcm_chunks.append(decoded_pcm)
+                pcm_len += len(decoded_pcm)
+
                 cur_idx += packet_size
 
-                if result_byte_limit > 0 and len(total_pcm) > result_byte_limit:
+                if result_byte_limit > 0 and pcm_len > result_byte_limit:
                     reduced = True
-                    total_pcm = total_pcm[:result_byte_limit]
                     break
 
-            format = f'{self.header.bom}{len(total_pcm) // 2}h'
-            dst.extend(struct.unpack(format, total_pcm))
+            total_pcm = b''.join(pcm_chunks)
+            if reduced:
+                total_pcm = total_pcm[:result_byte_limit]
+
+            dst = array('h')
+            dst.frombytes(total_pcm[:len(total_pcm) - (len(total_pcm) & 1)])
+            if (self.header.bom == '>') != (sys.byteorder == 'big'):
+                dst.byteswap()
 
         if not reduced: # don't cache partially decoded samples
             self.decoded_channels[channel_idx] = dst
         
         return dst
     
-    def decode(self, sample_limit_per_channel: int = 0) -> List[List[int]]:
-        """returns a list of lists of PCM16 (short) samples, one list per channel"""
+    def decode(self, sample_limit_per_channel: int = 0) -> List[array]:
+        """returns a list of array('h') of PCM16 (short) samples, one per channel"""
         if self.raw_bytes is not None:
             raise ValueError("Decoding not supported for raw/unknown BWAV assets")
-        result: List[List[int]] = []
+        result: List[array] = []
         for channel_idx in range(self.header.num_channels):
             result.append(self.decode_channel(channel_idx, sample_limit_per_channel))
 
@@ -581,17 +704,24 @@ class Bwav: #https://gota7.github.io/Citric-Composer/specs/binaryWav.html
         with wave.open(path, "wb") as output:
             samples = self.decode()
 
-            # wanted to use zip(), but it was so hecking slow, this is like 100* faster
-            pack_format = self.header.bom + "h"
-            data = bytearray()
-            for i in range(self.channel_infos[0].num_samples_this):
-                for chan in range(self.header.num_channels):
-                    data.extend(struct.pack(pack_format, samples[chan][i]))
-
-            output.setnchannels(self.header.num_channels)
+            num_channels = self.header.num_channels
+            num_samples = self.channel_infos[0].num_samples_this
+
+            # interleave whole channels at once with extended-slice assignment
+            # (runs in C) instead of a per-sample struct.pack double loop
+            interleaved = array('h', bytes(2 * num_samples * num_channels))
+            for chan in range(num_channels):
+                channel = samples[chan]
+                if not isinstance(channel, array):
+                    channel = array('h', channel)
+                interleaved[chan::num_channels] = channel[:num_samples]
+            if sys.byteorder == 'big':
+                interleaved.byteswap() # wave frames are little-endian
+
+            output.setnchannels(num_channels)
             output.setframerate(self.channel_infos[0].sample_rate)
             output.setsampwidth(2)
-            output.writeframes(data)
+            output.writeframes(interleaved.tobytes())
 
     def convert_to_opus(self) -> None:
         if self.raw_bytes is not None:
@@ -606,15 +736,21 @@ class Bwav: #https://gota7.github.io/Citric-Composer/specs/binaryWav.html
         non_compatible = [x for x in self.channel_infos if x.sample_rate != 48000]
         if non_compatible:
             raise ValueError("Invalid sample rate, must be 48000Hz")
-        
-        import pyogg
+
+        pyogg = _get_pyogg()
 
         converted: List[bytes] = []
         for channel_idx in range(self.header.num_channels):
             samples = self.decode_channel(channel_idx)
 
-            pack_format = f"{self.header.bom}{len(samples)}h"
-            data = struct.pack(pack_format, *samples)
+            # samples is a native int16 array: tobytes() is a memcpy, no need
+            # to splat every sample through struct.pack
+            if (self.header.bom == '>') != (sys.byteorder == 'big'):
+                swapped = array('h', samples) # copy so the decode cache stays native-order
+                swapped.byteswap()
+                data = swapped.tobytes()
+            else:
+                data = samples.tobytes()
             data_len = len(data)
 
             opus_enc = pyogg.OpusEncoder()
@@ -629,7 +765,7 @@ class Bwav: #https://gota7.github.io/Citric-Composer/specs/binaryWav.html
             desired_data_portion_size = desired_frame_size * bits_per_frame
 
             cur_idx = 0
-            result = bytes()
+            result_parts = []
             while cur_idx < data_len:
                 read_to = cur_idx + desired_data_portion_size
                 pcm = data[cur_idx:read_to]
@@ -639,15 +775,17 @@ class Bwav: #https://gota7.github.io/Citric-Composer/specs/binaryWav.html
                     pcm += b"\x00" * null_byte_count
 
                 encoded = opus_enc.encode(pcm)
-                result += struct.pack('>I', len(encoded)) + (b'\x00' * 4) + encoded
+                result_parts.append(_U32['>'].pack(len(encoded)) + (b'\x00' * 4) + encoded)
                 cur_idx += desired_data_portion_size
 
+            result = b''.join(result_parts)
+
             skip = opus_enc.get_algorithmic_delay()
 
             final_opus = b'\x01\x00\x00\x80\x18\x00\x00\x00\x00\x01\x00\x00\x80\xBB\x00\x00\x20\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
-            final_opus += struct.pack(self.header.bom + "I", skip)
+            final_opus += _U32[self.header.bom].pack(skip)
             final_opus += b'\x04\x00\x00\x80'
-            final_opus += struct.pack(self.header.bom + "I", len(result))
+            final_opus += _U32[self.header.bom].pack(len(result))
             final_opus += result
             
             converted.append(final_opus)
@@ -656,6 +794,7 @@ class Bwav: #https://gota7.github.io/Citric-Composer/specs/binaryWav.html
         for channel_idx, channel_info in enumerate(self.channel_infos):
             channel_info.codec = 2
             channel_info.dsp_adpcm_coefficients = b'\x00' * 32
+            channel_info.coefs = array('h', bytes(32)) # keep the parsed copy in sync
             channel_info.history_sample_1 = 0
             channel_info.history_sample_2 = 0
             channel_info.predictor_scale = 0
@@ -673,13 +812,17 @@ class Bwav: #https://gota7.github.io/Citric-Composer/specs/binaryWav.html
             channel_info.loop_end_sample = 0xFFFFFFFF
 
             initial_offset += pad_till(final_size)
-        
+
+        self._cached_size = None # samples were replaced
         self.recalculate_crc()
     
     def recalculate_crc(self) -> None:
+        # zlib.crc32 is the hardware-accelerated implementation binascii wraps;
+        # bind it locally and stream the running crc across channels
+        _crc32 = zlib.crc32
         crc = 0
         for sample_data in self.channel_samples:
-            crc = binascii.crc32(sample_data, crc)
+            crc = _crc32(sample_data, crc)
         self.header.crc = crc
     
     def print_info(self) -> None:
@@ -722,81 +865,104 @@ class Bars:
         self.version_minor: int
         self.version_major: int
         self.meta_count: int
-        self.crc_hashes: List[int] = []
+        self.crc_hashes: array = array('I') # uint32 name hashes, kept sorted
         self.meta_offsets: List[int] = []
         self.asset_offsets: List[int] = []
         self.unknown: bytes # TODO no idea what it is, it can be different size between different BARS, even with the same amount of assets
         self.metas: List[Amta] = []
         self.assets: List[Bwav] = []
         self.filepath: str = None # don't write to file, only assigned when path was provided
+        self._raw_bytes: bytes = None # full input, kept so callers can reuse it without re-reading
+        self._asset_spans: List[tuple] = [] # (offset, size) of each asset inside _raw_bytes
 
 
-        reader: BufferedReader
-        reader_opened_here = False
         if isinstance(path_or_bufferedReader, str):
             self.filepath = path_or_bufferedReader
-            reader = open(path_or_bufferedReader, "rb")
-            reader_opened_here = True
+            with open(path_or_bufferedReader, "rb") as f:
+                self._raw_bytes = f.read()
         else:
-            reader = path_or_bufferedReader
-        
-        self.magic = reader.read(4)
-        assert self.magic == b'BARS'
+            self._raw_bytes = path_or_bufferedReader.read()
+        # parse the fixed header and tables straight off the in-memory buffer
+        # with an integer cursor: no small reader.read() allocations
+        buf = self._raw_bytes
 
-        size = reader.read(4)
+        self.magic = buf[0:4]
+        assert self.magic == b'BARS'
 
-        bom = reader.read(2)
+        bom = buf[8:10]
         assert bom == b'\xFE\xFF' or bom == b'\xFF\xFE'
         self.bom = '>' if bom == b'\xFE\xFF' else '<'
 
-        version = reader.read(2)
-
-        meta_count = reader.read(4)
-
-        self.size, self.version_minor, self.version_major, self.meta_count = struct.unpack(self.bom + 'I2BI', size + version + meta_count)
-
-        self.crc_hashes.extend(struct.unpack(self.bom + 'I' * self.meta_count, reader.read(4 * self.meta_count)))
-
-        for _ in range(self.meta_count):
-            chunk = reader.read(8)
-            if len(chunk) < 8:
-                # truncated entry; stop here
-                break
-            meta_offset, asset_offset = struct.unpack(self.bom + '2I', chunk)
-            self.meta_offsets.append(meta_offset)
-            self.asset_offsets.append(asset_offset)
+        self.size, = _U32[self.bom].unpack_from(buf, 4)
+        self.version_minor, self.version_major, self.meta_count = _VER_SIZE[self.bom].unpack_from(buf, 10)
+
+        pos = 16
+        # bulk memcpy of the CRC table into native uint32 storage instead of
+        # unpacking a tuple of boxed ints
+        self.crc_hashes.frombytes(buf[pos:pos + 4 * self.meta_count])
+        if (self.bom == '>') != (sys.byteorder == 'big'):
+            self.crc_hashes.byteswap()
+        pos += 4 * self.meta_count
+
+        # decode the whole offset table in one C-level unpack and deinterleave
+        # with strided slices; clamp to whole 8-byte entries in case of a
+        # truncated table
+        entries = min(self.meta_count, max(0, (len(buf) - pos) // 8))
+        pairs = struct.unpack_from(self.bom + f'{2 * entries}I', buf, pos)
+        self.meta_offsets = list(pairs[0::2])
+        self.asset_offsets = list(pairs[1::2])
+        pos += 8 * entries
         # adjust meta_count in case of truncated table
         self.meta_count = min(self.meta_count, len(self.meta_offsets))
         self.crc_hashes = self.crc_hashes[:self.meta_count]
 
         if self.meta_offsets:
-            self.unknown = reader.read(max(0, self.meta_offsets[0] - reader.tell()))
+            self.unknown = buf[pos:max(pos, self.meta_offsets[0])]
         else:
             self.unknown = b''
 
+        # metas and assets still parse through a stream interface
+        reader = BytesIO(self._raw_bytes)
+
         for meta_offset in self.meta_offsets:
             reader.seek(meta_offset)
             amta = Amta(reader)
             self.metas.append(amta)
 
+        # each asset runs until the next higher offset (or end of file); build
+        # that lookup once instead of scanning the whole offset list per asset
+        sorted_unique = sorted(set(self.asset_offsets))
+        next_off = {}
+        for i, offset in enumerate(sorted_unique):
+            next_off[offset] = sorted_unique[i + 1] if i + 1 < len(sorted_unique) else self.size
+
         asset_cache = {}
+        # hand each asset a zero-copy view of the input buffer rather than
+        # seeking and copying its bytes out of the stream
+        mv = memoryview(self._raw_bytes)
         for asset_offset in self.asset_offsets:
             if asset_offset in asset_cache:
-                self.assets.append(asset_cache[asset_offset])
+                asset, read_size = asset_cache[asset_offset]
+                self.assets.append(asset)
+                self._asset_spans.append((asset_offset, read_size))
                 continue
 
-            higher_offsets = [offset for offset in self.asset_offsets if offset > asset_offset]
-            read_size = (min(higher_offsets) if higher_offsets else self.size) - asset_offset
-            read_size = max(0, read_size)
+            read_size = max(0, next_off[asset_offset] - asset_offset)
 
-            reader.seek(asset_offset)
-            blob = reader.read(read_size)
+            blob = mv[asset_offset:asset_offset + read_size]
             asset = self._load_asset_from_bytes(blob)
-            asset_cache[asset_offset] = asset
+            asset_cache[asset_offset] = (asset, read_size)
             self.assets.append(asset)
+            self._asset_spans.append((asset_offset, read_size))
 
-        if reader_opened_here:
-            reader.close()
+    def asset_raw_bytes(self, idx: int) -> memoryview:
+        """Original bytes of asset idx, sliced out of the input buffer.
+
+        Equivalent to re-serializing self.assets[idx] as long as the asset
+        has not been modified, but O(1) and allocation-free.
+        """
+        offset, size = self._asset_spans[idx]
+        return memoryview(self._raw_bytes)[offset:offset + size]
 
     def write(self, path_or_bufferedWriter: Union[str, BufferedWriter]):
         writer: BufferedWriter = None
@@ -819,27 +985,38 @@ class Bars:
         self.calculate_offsets()
         self.size = self.get_size()
 
-        writer.write(self.magic) # 4
-        writer.write(struct.pack(self.bom + 'I', self.size)) # 4
-        writer.write(b'\xFE\xFF' if self.bom == '>' else b'\xFF\xFE') # 2
-        writer.write(struct.pack(self.bom + '2BI', self.version_minor, self.version_major, self.meta_count)) # 6
-
-        writer.write(struct.pack(self.bom + 'I' * self.meta_count, *self.crc_hashes)) # 4 * self.meta_count
+        # assemble the full file in memory: the per-meta/per-asset seeks below
+        # become pointer bumps in a BytesIO instead of flushes on the output,
+        # and the finished file goes out in one write
+        out = BytesIO()
+
+        meta_count = self.meta_count
+        # build the entire fixed header - magic, size, bom, version, count,
+        # CRC table and offset table - in one buffer and emit a single write
+        header = bytearray(16 + 4 * meta_count + 8 * meta_count)
+        header[0:4] = self.magic # 4
+        _U32[self.bom].pack_into(header, 4, self.size) # 4
+        header[8:10] = b'\xFE\xFF' if self.bom == '>' else b'\xFF\xFE' # 2
+        _VER_SIZE[self.bom].pack_into(header, 10, self.version_minor, self.version_major, meta_count) # 6
+        struct.pack_into(self.bom + f'{meta_count}I', header, 16, *self.crc_hashes) # 4 * meta_count
+
+        table_base = 16 + 4 * meta_count
+        pack_pair = _OFF_PAIR[self.bom].pack_into
+        for idx in range(meta_count):
+            pack_pair(header, table_base + idx * 8, self.meta_offsets[idx] & 0xFFFFFFFF, self.asset_offsets[idx] & 0xFFFFFFFF) # 8 * meta_count
+        out.write(header)
+
+        out.write(self.unknown)
 
-        for idx in range(self.meta_count):
-            meta_off = self.meta_offsets[idx] & 0xFFFFFFFF
-            asset_off = self.asset_offsets[idx] & 0xFFFFFFFF
-            writer.write(struct.pack(self.bom + '2I', meta_off, asset_off)) # 8 * self.meta_count
-
-        writer.write(self.unknown)
-        
         for idx, meta_offset in enumerate(self.meta_offsets):
-            writer.seek(meta_offset)
-            self.metas[idx].write(writer)
+            out.seek(meta_offset)
+            self.metas[idx].write(out)
 
         for idx, asset_offset in enumerate(self.asset_offsets):
-            writer.seek(asset_offset)
-            self.assets[idx].write(writer)
+            out.seek(asset_offset)
+            self.assets[idx].write(out)
+
+        writer.write(out.getbuffer())
 
         if writer_opened_here:
             writer.close()
@@ -848,24 +1025,27 @@ class Bars:
         header_crc_metas_part = self.get_header_size(self.meta_count)
 
         # get only unique assets, as some metas can point to the same asset
+        seen_offsets = set()
         unique_assets: List[Tuple[int, int]] = []
         for idx in range(self.meta_count):
-            if not [idx_offset_tuple for idx_offset_tuple in unique_assets if idx_offset_tuple[1] == self.asset_offsets[idx]]:
-                unique_assets.append((idx, self.asset_offsets[idx]))
+            offset = self.asset_offsets[idx]
+            if offset not in seen_offsets:
+                seen_offsets.add(offset)
+                unique_assets.append((idx, offset))
             
         assets_part = 0  
         if self.meta_count > 0:
             last_idx = unique_assets[-1][0]
 
             # condition below - the last BWAV doesn't need to be padded
-            assets_part = sum([pad_till(self.assets[idx].get_size()) if idx != last_idx else self.assets[idx].get_size() for idx, _ in unique_assets])
+            assets_part = sum(pad_till(self.assets[idx].get_size()) if idx != last_idx else self.assets[idx].get_size() for idx, _ in unique_assets)
 
         full_size = header_crc_metas_part + assets_part
 
         return full_size
     
     def get_header_size(self, custom_count) -> int:
-        return pad_till(4 + 4 + 2 + 6 + (4 * custom_count) + (8 * custom_count) + len(self.unknown) + (sum([meta.get_size() for meta in self.metas])))
+        return pad_till(4 + 4 + 2 + 6 + (4 * custom_count) + (8 * custom_count) + len(self.unknown) + sum(meta.get_size() for meta in self.metas))
     
     def get_preheader_size(self, custom_count) -> int:
         return 4 + 4 + 2 + 6 + (4 * custom_count) + (8 * custom_count) + len(self.unknown)
@@ -888,9 +1068,77 @@ class Bars:
                 self.asset_offsets.append(self.asset_offsets[-1] + pad_till(self.assets[idx - 1].get_size()))
             else:
                 self.asset_offsets.append(bars_header_size)
-    
-    def _load_asset_from_bytes(self, data: bytes):
+
+    def _tables_match_recurrence(self) -> bool:
+        """True when the stored offset tables equal what calculate_offsets
+        would rebuild. Some shipped files pack metas tighter than their
+        declared sizes or share asset offsets; those tables cannot be
+        shifted uniformly and need the full recompute."""
+        if self.meta_offsets[0] != self.get_preheader_size(self.meta_count):
+            return False
+        for idx in range(1, self.meta_count):
+            if self.meta_offsets[idx] != self.meta_offsets[idx - 1] + self.metas[idx].get_size():
+                return False
+        if self.asset_offsets[0] != self.get_header_size(self.meta_count):
+            return False
+        for idx in range(1, self.meta_count):
+            if self.asset_offsets[idx] != self.asset_offsets[idx - 1] + pad_till(self.assets[idx - 1].get_size()):
+                return False
+        return True
+
+    def _insert_offsets(self, insertion_index: int, new_amta, new_bwav) -> None:
+        """Shift the existing offset tables for one insertion.
+
+        Produces what calculate_offsets would after the insertion, but in
+        O(N) adds/copies instead of rebuilding both tables.
+        Only valid when the stored tables are already exactly what
+        calculate_offsets would produce (see _tables_match_recurrence):
+        shared or otherwise non-normalized offsets would be shifted as-is
+        while the recompute rewrites them, so such files must take the
+        full recompute instead.
+        Must be called BEFORE the new entries are inserted into the lists,
+        while the old sizes are still intact."""
+        k = insertion_index
+        count = self.meta_count
+        meta_grow = new_amta.get_size()
+
+        # growing the tables costs 4 bytes of CRC + 8 bytes of offsets
+        new_preheader = self.get_preheader_size(count + 1)
+
+        meta_offsets = self.meta_offsets
+        if k == 0:
+            # calculate_offsets adds the size of the meta at the CURRENT index
+            # (not the previous one), so inserting at the front pushes the old
+            # first meta's size into every displaced offset
+            displaced_delta = 12 + self.metas[0].get_size()
+            self.meta_offsets = [new_preheader] + [off + displaced_delta for off in meta_offsets]
+        else:
+            new_meta_offset = meta_offsets[k - 1] + 12 + meta_grow
+            self.meta_offsets = [off + 12 for off in meta_offsets[:k]] \
+                + [new_meta_offset] \
+                + [off + 12 + meta_grow for off in meta_offsets[k:]]
+
+        # asset base moves by the header growth (table bytes + new AMTA, re-padded)
+        metas_total = sum(meta.get_size() for meta in self.metas)
+        old_header = pad_till(self.get_preheader_size(count) + metas_total)
+        new_header = pad_till(new_preheader + meta_grow + metas_total)
+        header_delta = new_header - old_header
+        asset_grow = pad_till(new_bwav.get_size())
+
+        asset_offsets = self.asset_offsets
+        if k == len(asset_offsets):
+            new_asset_offset = asset_offsets[-1] + pad_till(self.assets[-1].get_size()) + header_delta
+            self.asset_offsets = [off + header_delta for off in asset_offsets] + [new_asset_offset]
+        else:
+            new_asset_offset = asset_offsets[k] + header_delta
+            self.asset_offsets = [off + header_delta for off in asset_offsets[:k]] \
+                + [new_asset_offset] \
+                + [off + header_delta + asset_grow for off in asset_offsets[k:]]
+
+    def _load_asset_from_bytes(self, data: Union[bytes, memoryview]):
         if data[:4] == b'BWAV':
+            # a BWAV gets parsed through a stream, which copies once; raw
+            # passthrough assets keep the view as-is
             return Bwav(BytesIO(data), len(data))
         return RawAsset(data)
 
@@ -1042,7 +1290,20 @@ class Bars:
         
         # Calculate Insertion point
         insertion_index = bisect.bisect_left(self.crc_hashes, name_hash)
-        
+
+        # Shift the offset tables incrementally while the old sizes are still
+        # in place; a Bars whose tables are inconsistent or not exactly what
+        # calculate_offsets would rebuild (shared asset offsets, metas packed
+        # tighter than their declared sizes) falls back to the full recompute
+        # after insertion
+        tables_consistent = self.meta_count > 0 \
+            and len(self.meta_offsets) == self.meta_count \
+            and len(self.asset_offsets) == self.meta_count \
+            and len(set(self.asset_offsets)) == len(self.asset_offsets) \
+            and self._tables_match_recurrence()
+        if tables_consistent:
+            self._insert_offsets(insertion_index, new_amta, new_bwav)
+
         # Add to lists
         self.metas.insert(insertion_index, new_amta)
         self.assets.insert(insertion_index, new_bwav)
@@ -1050,7 +1311,8 @@ class Bars:
 
         # Set bars vars
         self.meta_count += 1
-        self.calculate_offsets()
+        if not tables_consistent:
+            self.calculate_offsets()
         self.size = self.get_size()
     
         return True
@@ -1,4 +1,31 @@
+"""MK8DX character placement editor.
+
+Performance notes
+-----------------
+The hot paths here are memory/IO bound, not CPU math: (a) PIL decode+resize,
+already SIMD inside Pillow's C resampler, and (b) Tk widget/event plumbing,
+which is dominated by window-system round trips. There is no Python numeric
+loop that would benefit from NumPy/Numba or GPU offload, so optimization work
+should stay on three levers:
+
+* keep C code off the GIL (threaded icon decode, oead/PIL doing the work);
+* data layout and reuse (disk icon cache, canvas-based virtualized library,
+  pooled overlays and drag ghost, lru_cache on pure helpers);
+* precompute what is static (label templates, target maps, CRC indexes).
+
+If icon loading ever dominates again, installing pillow-simd is the only
+"wider instructions" lever available: it swaps in AVX2 resize/convert paths
+with no code change here.
+"""
+
+import bisect
+import functools
 import os
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 import json
 import math
 import random
@@ -9,18 +36,23 @@ import io
 import time
 import subprocess
 from contextlib import redirect_stdout, redirect_stderr, contextmanager
-from io import BytesIO
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from PIL import Image, ImageTk
-import oead
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 if str(SCRIPT_DIR) not in sys.path:
     sys.path.insert(0, str(SCRIPT_DIR))
 
-from mk8dx_audio_classes import Bars, calculate_crc32_hash, pad_till
+from mk8dx_audio_classes import Bars, calculate_crc32_hash
+
+try:
+    # parse 1.5-5x plus vite que json sur les gros fichiers ; optionnel
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 ICON = 64
 TEXT_H = 28
@@ -115,6 +147,24 @@ GROUP_SLOT_NAMES = {
 PREFIX = "tc_Chara_"
 IMAGE_EXT = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".webp")
 
+# Les noms fixes et leurs fichiers par defaut ne dependent que des deux
+# tables ci-dessus : calcules une fois a l'import
+_ALL_FIXED_NAMES = frozenset(CASE_NAME_BY_INDEX.values()).union(*GROUP_SLOT_NAMES.values())
+
+
+def _default_files_for_name(name):
+    return {
+        "Driver": f"Driver/{name}.szs",
+        "Audio/DriverMenu": f"Audio/DriverMenu/MenuDriver_{name}.bars",
+        "Audio/Driver": f"Audio/Driver/Driver_{name}.bars",
+        "ui": f"tc_Chara_{name}^l.png",
+        "ui_ed": f"tc_edChara_{name}^l.png",
+        "ui_map": f"tc_MapChara_{name}^l.png",
+    }
+
+
+_DEFAULT_FILES_BY_NAME = {n: _default_files_for_name(n) for n in sorted(_ALL_FIXED_NAMES)}
+
 AUDIO_MAP_FILENAME = "audio_assets_map.json"
 BFWAV_GROUPS_FILENAME = "bfwav_groups.json"
 BASE_AUDIO_DIRNAME = "Audio"
@@ -160,8 +210,13 @@ def _silence_dotnet_console():
         except Exception:
             pass
 
+@functools.lru_cache(maxsize=128)
 def _config_path(base: Path, filename: str) -> Path:
-    """Return path to a config file under config/, falling back to root."""
+    """Return path to a config file under config/, falling back to root.
+
+    Memoized : la resolution est stable pendant une session et chaque appel
+    coutait deux stat().
+    """
     config_dir = base / CONFIG_DIRNAME
     candidates = [config_dir / filename, base / filename]
     for cand in candidates:
@@ -193,7 +248,8 @@ def _load_bfwav_groups_at(base: Path):
         return {}
     name_to_group = {}
     for grp in data.get("groups", []):
-        members = set(grp)
+        # frozenset : partage entre tous les membres et utilisable comme cle de cache
+        members = frozenset(grp)
         for name in members:
             name_to_group[name] = members
     return name_to_group
@@ -265,15 +321,33 @@ def _replace_bars_with_groups(src_path: Path, dst_path: Path, name_to_group: dic
     return replaced, ignored
 
 
+# Un seul emplacement : la map est retenue avec son index, comparaison par
+# identite (pas par id() brut, recyclable une fois la map liberee)
+_audio_map_index_cache: list = []
+
+
+def _audio_map_index(audio_map) -> dict:
+    """bars name -> (section, entry) reverse index, built once per loaded map."""
+    if _audio_map_index_cache and _audio_map_index_cache[0] is audio_map:
+        return _audio_map_index_cache[1]
+    index = {
+        name: (section, entry)
+        for section, entries in audio_map.items()
+        for name, entry in entries.items()
+    }
+    _audio_map_index_cache[:] = [audio_map, index]
+    return index
+
+
 def _find_map_entry(audio_map, bars_path: str):
     """Return the config entry matching the selected .bars file."""
-    name = Path(bars_path).name
-    for section, entries in audio_map.items():
-        if name in entries:
-            entry = entries[name].copy()
-            entry["section"] = section
-            return entry
-    return None
+    hit = _audio_map_index(audio_map).get(Path(bars_path).name)
+    if hit is None:
+        return None
+    section, entry = hit
+    entry = entry.copy()
+    entry["section"] = section
+    return entry
 
 
 def _swap_prefix(name: str, src_prefix: str, dest_prefix: str) -> str:
@@ -282,27 +356,95 @@ def _swap_prefix(name: str, src_prefix: str, dest_prefix: str) -> str:
     return name
 
 
-def _asset_to_bytes(asset) -> bytes:
-    buf = BytesIO()
-    asset.write(buf)
-    return buf.getvalue()
+_name_hash_cache: dict[str, int] = {}
+
+
+def _name_hash(name: str) -> int:
+    """CRC32 of a bfwav name, memoized (names repeat across destinations)."""
+    h = _name_hash_cache.get(name)
+    if h is None:
+        h = _name_hash_cache[name] = calculate_crc32_hash(name)
+    return h
+
+
+def _crc_to_idx(bars: Bars) -> dict[int, int]:
+    """crc -> index map, cached on the Bars instance (source is reused across pairs)."""
+    cached = getattr(bars, "_crc_to_idx_cache", None)
+    if cached is None:
+        cached = {crc: idx for idx, crc in enumerate(bars.crc_hashes)}
+        bars._crc_to_idx_cache = cached
+    return cached
+
+
+_target_map_cache: dict = {}
+
+
+def _build_target_to_sources(src_prefix: str, dest_prefix: str, src_list, dest_list: set, name_to_group: dict[str, set]):
+    """target -> candidate sources mapping, plus the swapped name of each source.
+
+    Memoized : la meme paire (source, dest) revient pour chaque destination
+    traitee, inutile de refaire les swaps et intersections de groupes.
+    """
+    # name_to_group est epingle dans la valeur et compare par identite :
+    # un id() seul peut etre recycle par un dict ulterieur
+    key = (src_prefix, dest_prefix, tuple(src_list), frozenset(dest_list))
+    cached = _target_map_cache.get(key)
+    if cached is not None and cached[0] is name_to_group:
+        return cached[1], cached[2]
+
+    # Swap de prefixe calcule une seule fois par nom (reutilise par swapped_ok)
+    swapped = {
+        n: (n.replace(src_prefix, dest_prefix, 1) if src_prefix and dest_prefix and src_prefix in n else n)
+        for n in src_list
+    }
+    target_to_sources = {}
+    # Un groupe est partage par tous ses membres : son intersection avec la
+    # destination ne se calcule qu'une fois
+    group_intersections: dict[frozenset, frozenset] = {}
+    for src_name in src_list:
+        # Priorite : mapping direct par prefixe (source -> dest)
+        direct_target = swapped[src_name]
+        if direct_target in dest_list:
+            target_to_sources.setdefault(direct_target, set()).add(src_name)
+            continue
+        # Sinon, fallback par groupe
+        group = name_to_group.get(src_name)
+        if group is None:
+            targets = {src_name} & dest_list if dest_list else {src_name}
+        elif dest_list:
+            targets = group_intersections.get(group)
+            if targets is None:
+                targets = group_intersections[group] = group & dest_list
+        else:
+            targets = group
+        for target in targets:
+            target_to_sources.setdefault(target, set()).add(src_name)
+
+    _target_map_cache[key] = (name_to_group, target_to_sources, swapped)
+    return target_to_sources, swapped
+
+
+_PACK_U32_BE = struct.Struct('>I')
+_PACK_U32_LE = struct.Struct('<I')
 
 
 def _write_header_updates(dest_bytes: bytearray, bars_dest: Bars):
     """Rewrite size and asset_offsets in the header without touching metas."""
-    endian = '>' if bars_dest.bom == '>' else '<'
+    # Struct precompile : pas de re-parse du format a chaque champ
+    packer = _PACK_U32_BE if bars_dest.bom == '>' else _PACK_U32_LE
     meta_count = bars_dest.meta_count
 
     # Mettre à jour la taille totale
-    dest_bytes[4:8] = struct.pack(endian + 'I', len(dest_bytes))
+    packer.pack_into(dest_bytes, 4, len(dest_bytes))
 
     # Les paires (meta_offset, asset_offset) commencent après :
     # 4 (magic) + 4 (size) + 2 (bom) + 2 (version) + 4 (meta_count) + 4*meta_count (crc_hashes)
     table_start = 4 + 4 + 2 + 2 + 4 + (4 * meta_count)
-    for idx in range(min(meta_count, len(bars_dest.asset_offsets))):
-        asset_off = bars_dest.asset_offsets[idx] & 0xFFFFFFFF
-        pos = table_start + idx * 8 + 4  # +4 pour viser la partie asset_offset de la paire
-        dest_bytes[pos:pos + 4] = struct.pack(endian + 'I', asset_off)
+    count = min(meta_count, len(bars_dest.asset_offsets))
+    # +4 pour viser la partie asset_offset de chaque paire
+    positions = range(table_start + 4, table_start + 4 + 8 * count, 8)
+    for pos, asset_off in zip(positions, bars_dest.asset_offsets):
+        packer.pack_into(dest_bytes, pos, asset_off & 0xFFFFFFFF)
 
 
 def _transfer_bfwavs(bars_source: Bars, bars_dest: Bars, src_info, dest_info, name_to_group: dict[str, set], dest_bytes: bytearray):
@@ -311,35 +453,31 @@ def _transfer_bfwavs(bars_source: Bars, bars_dest: Bars, src_info, dest_info, na
     src_list = src_info.get("bfwav", []) or []
     dest_list = set(dest_info.get("bfwav", []) or [])
 
-    src_crc_to_idx = {crc: idx for idx, crc in enumerate(bars_source.crc_hashes)}
-    dest_crc_to_idx = {crc: idx for idx, crc in enumerate(bars_dest.crc_hashes)}
+    src_crc_to_idx = _crc_to_idx(bars_source)
+    dest_crc_to_idx = _crc_to_idx(bars_dest)
 
-    # Build target -> candidate sources mapping
-    target_to_sources = {}
-    for src_name in src_list:
-        # Priorite : mapping direct par prefixe (source -> dest)
-        direct_target = _swap_prefix(src_name, src_prefix, dest_prefix)
-        if direct_target in dest_list:
-            target_to_sources.setdefault(direct_target, set()).add(src_name)
-            continue
-        # Sinon, fallback par groupe
-        group = name_to_group.get(src_name, {src_name})
-        targets = group & dest_list if dest_list else group
-        for target in targets:
-            target_to_sources.setdefault(target, set()).add(src_name)
+    target_to_sources, swapped = _build_target_to_sources(
+        src_prefix, dest_prefix, src_list, dest_list, name_to_group
+    )
 
     replaced = 0
     ignored = []
+    offsets_dirty = False  # vrai seulement si taille/offsets ont bouge
+    # Collecter d'abord tous les remplacements sans toucher dest_bytes,
+    # puis reconstruire le buffer en un seul passage (evite les memmove en cascade).
+    edits = {}  # start -> (end, padded)
+
+    # Offsets tries une fois : la borne de chaque slot se trouve par bisect
+    sorted_offsets = sorted(bars_dest.asset_offsets)
+    total_len = len(dest_bytes)
 
     for dest_name, sources in target_to_sources.items():
-        # Choisir de preference une source dont le swap prefixe == dest_name
-        def swapped_ok(n):
-            return _swap_prefix(n, src_prefix, dest_prefix) == dest_name
-        candidates = [n for n in sources if swapped_ok(n)]
-        src_name = random.choice(candidates or list(sources))
+        # Choisir de preference une source dont le swap prefixe == dest_name,
+        # de facon deterministe (resultat stable et cachable d'une execution a l'autre)
+        src_name = min((n for n in sources if swapped[n] == dest_name), default=min(sources))
 
-        src_hash = calculate_crc32_hash(src_name)
-        dest_hash = calculate_crc32_hash(dest_name)
+        src_hash = _name_hash(src_name)
+        dest_hash = _name_hash(dest_name)
 
         src_idx_resolved = src_crc_to_idx.get(src_hash)
         dest_idx = dest_crc_to_idx.get(dest_hash)
@@ -351,35 +489,55 @@ def _transfer_bfwavs(bars_source: Bars, bars_dest: Bars, src_info, dest_info, na
             ignored.append(dest_name)
             continue
 
-        # Offsets actuels (mise à jour après chaque insertion si besoin)
+        # Offsets d'origine (aucune insertion n'a encore eu lieu)
         start = bars_dest.asset_offsets[dest_idx]
-        next_offsets = [o for o in bars_dest.asset_offsets if o > start]
-        end = min(next_offsets) if next_offsets else len(dest_bytes)
+        j = bisect.bisect_right(sorted_offsets, start)
+        end = sorted_offsets[j] if j < len(sorted_offsets) else total_len
         slot_size = end - start
 
-        new_data = _asset_to_bytes(bars_source.assets[src_idx_resolved])
-        new_size = pad_till(len(new_data))
-        padded = new_data + b"\x00" * (new_size - len(new_data))
+        # Tranche directe du buffer source : pas de re-serialisation de l'asset
+        new_data = bars_source.asset_raw_bytes(src_idx_resolved)
+        new_size = (len(new_data) + 63) & -64  # pad_till(..., 64) sans appel de fonction
+        pad = new_size - len(new_data)
+        if new_size < slot_size:
+            # Remplacement en place, garder la taille du slot pour ne pas toucher aux offsets
+            pad += slot_size - new_size
+        padded = b"".join((new_data, b"\x00" * pad)) if pad else new_data
 
-        size_diff = new_size - slot_size
+        edits[start] = (end, padded)
+        replaced += 1
 
-        if size_diff <= 0:
-            # Remplacement en place, garder la taille du slot pour ne pas toucher aux offsets
-            dest_bytes[start:end] = padded + b"\x00" * (-size_diff)
-        else:
-            # Besoin d'agrandir : on insère et on decale les offsets suivants
-            dest_bytes[start:end] = padded
+    if edits:
+        # Reconstruction en un seul passage : segments intacts + remplacements,
+        # en accumulant le decalage applique aux offsets suivants.
+        chunks = []
+        starts = sorted(edits)
+        deltas = []  # decalage cumule apres chaque edit
+        prev = 0
+        delta = 0
+        for start in starts:
+            end, padded = edits[start]
+            chunks.append(dest_bytes[prev:start])
+            chunks.append(padded)
+            delta += len(padded) - (end - start)
+            deltas.append(delta)
+            prev = end
+        chunks.append(dest_bytes[prev:])
+        dest_bytes = bytearray(b"".join(chunks))
+
+        if delta != 0:
             for i, off in enumerate(bars_dest.asset_offsets):
-                if off > start:
-                    bars_dest.asset_offsets[i] = off + size_diff
+                # Decalage = somme des deltas des edits strictement avant cet offset
+                j = bisect.bisect_left(starts, off)
+                if j > 0:
+                    bars_dest.asset_offsets[i] = off + deltas[j - 1]
             bars_dest.size = len(dest_bytes)
+            offsets_dirty = True
 
-        replaced += 1
+    return replaced, ignored, dest_bytes, offsets_dirty
 
-    return replaced, ignored, dest_bytes
 
-
-def _process_bars_pair(source_path: str, dest_path: str, audio_map, bfwav_groups=None, bars_cache=None):
+def _process_bars_pair(source_path: str, dest_path: str, audio_map, bfwav_groups=None, bars_cache=None, writer=None):
     src_info = _find_map_entry(audio_map, source_path)
     dest_info = _find_map_entry(audio_map, dest_path)
 
@@ -389,7 +547,12 @@ def _process_bars_pair(source_path: str, dest_path: str, audio_map, bfwav_groups
         return None
 
     bars_cache = bars_cache if bars_cache is not None else {}
-    bars_source = bars_cache.get(source_path)
+    try:
+        src_mtime = os.stat(source_path).st_mtime_ns
+    except OSError:
+        src_mtime = None
+    cached = bars_cache.get(source_path)
+    bars_source = cached[1] if cached is not None and cached[0] == src_mtime else None
     if bars_source is None:
         # Garder au plus une source .bars en memoire pour eviter un cache gigantesque
         if bars_cache:
@@ -397,31 +560,146 @@ def _process_bars_pair(source_path: str, dest_path: str, audio_map, bfwav_groups
         print(f"Loading source: {source_path}")
         try:
             bars_source = Bars(source_path)
-            bars_cache[source_path] = bars_source
+            bars_cache[source_path] = (src_mtime, bars_source)
         except Exception as e:
             print(f"[ERROR] Failed to read source ({source_path}): {e}")
             return None
 
     try:
         bars_dest = Bars(dest_path)
+        # Bars garde le contenu brut : pas de seconde lecture du fichier
+        dest_bytes = bytearray(bars_dest._raw_bytes)
     except Exception as e:
         print(f"[ERROR] Failed to read destination ({dest_path}): {e}")
         return None
-    dest_bytes = bytearray(Path(dest_path).read_bytes())
 
     bfwav_groups = bfwav_groups or {}
-    replaced, ignored, dest_bytes = _transfer_bfwavs(
+    replaced, ignored, dest_bytes, offsets_dirty = _transfer_bfwavs(
         bars_source, bars_dest, src_info, dest_info, bfwav_groups, dest_bytes
     )
-    _write_header_updates(dest_bytes, bars_dest)
+    # Si tout est reste en place, l'en-tete d'origine est deja correct
+    if offsets_dirty:
+        _write_header_updates(dest_bytes, bars_dest)
     print(f"Replacements done: {replaced}")
     if ignored:
         print(f"Ignored (missing in destination after prefix swap): {len(ignored)}")
 
+    if writer is not None:
+        # write_bytes relache le GIL : l'ecriture recouvre le parsing suivant.
+        # Le futur est rendu a l'appelant, qui attend son resultat pour que
+        # les erreurs d'ecriture remontent au lieu de mourir dans l'executor.
+        return replaced, ignored, writer.submit(Path(dest_path).write_bytes, dest_bytes)
     Path(dest_path).write_bytes(dest_bytes)
     return replaced, ignored
 
 
+# ioctl FICLONE : clone CoW (reflink) sur btrfs/xfs, aucune donnee copiee
+_FICLONE = 0x40049409
+
+
+def _try_reflink(src, dst) -> bool:
+    """Clone src vers dst via FICLONE ; False si le FS ne sait pas faire."""
+    if fcntl is None:
+        return False
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        return True
+    except OSError:
+        return False  # FS sans reflink (ext4, NTFS...) ; dst sera reecrase
+
+
+def _fast_copyfile(src, dst):
+    """Copy file contents only (no metadata), without userspace buffers.
+
+    Essaie dans l'ordre : reflink FICLONE (O(1) sur FS copy-on-write),
+    copy_file_range puis sendfile (copie cote noyau, pas de tampon Python),
+    et retombe sur shutil.copyfile ailleurs. Les metadonnees (copy2) ne sont
+    pas copiees : inutiles pour des fichiers de jeu recrees a chaque export.
+    """
+    if _try_reflink(src, dst):
+        return
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            sfd, dfd = s.fileno(), d.fileno()
+            size = os.fstat(sfd).st_size
+            offset = 0
+            try:
+                while offset < size:
+                    sent = os.copy_file_range(sfd, dfd, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                if offset >= size:
+                    return
+            except (AttributeError, OSError):
+                pass
+            # sendfile reprend la ou copy_file_range s'est arrete
+            while offset < size:
+                sent = os.sendfile(dfd, sfd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            if offset >= size:
+                return
+    except (AttributeError, OSError):
+        pass
+    # Windows ou FS sans ces syscalls
+    shutil.copyfile(src, dst)
+
+
+def _process_bars_pair_worker(args):
+    """Worker process : re-parse la source localement (Bars ne se pickle pas bien)."""
+    source_path, dest_path, audio_map, bfwav_groups = args
+    return dest_path, _process_bars_pair(source_path, dest_path, audio_map, bfwav_groups)
+
+
+def _process_bars_pairs(source_path: str, dest_paths: list[str], audio_map, bfwav_groups=None):
+    """Process several destination .bars against the same source.
+
+    Destinations are independent, so with more than one of them the work is
+    fanned out to a process pool (BARS parsing and CRC hashing are CPU-bound,
+    and the reads/writes overlap). Each worker re-reads the source from disk
+    instead of pickling the parsed Bars object. Returns {dest_path: result}.
+    """
+    bfwav_groups = bfwav_groups or {}
+    if len(dest_paths) > 1:
+        try:
+            from concurrent.futures import ProcessPoolExecutor
+
+            workers = min(len(dest_paths), os.cpu_count() or 1)
+            args = [(source_path, d, audio_map, bfwav_groups) for d in dest_paths]
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                return dict(ex.map(_process_bars_pair_worker, args))
+        except Exception as e:
+            print(f"[WARN] Process pool unavailable ({e}), processing serially")
+    from concurrent.futures import ThreadPoolExecutor
+
+    bars_cache: dict[str, tuple[int, Bars]] = {}
+    results = {}
+    # Deux threads d'ecriture suffisent : les .bars font 1-20 MB chacun
+    with ThreadPoolExecutor(max_workers=2) as writer:
+        pending = {}
+        for d in dest_paths:
+            res = _process_bars_pair(
+                source_path, d, audio_map, bfwav_groups, bars_cache, writer=writer
+            )
+            if isinstance(res, tuple) and len(res) == 3:
+                results[d] = res[:2]
+                pending[d] = res[2]
+            else:
+                results[d] = res
+        # Une ecriture ratee (disque plein, droits...) doit compter comme un
+        # echec de la destination, pas etre avalee par l'executor
+        for d, future in pending.items():
+            try:
+                future.result()
+            except Exception as e:
+                print(f"[ERROR] Failed to write destination ({d}): {e}")
+                results[d] = None
+    return results
+
+
 def _load_bfres_bindings(lib_dir: Path):
     """Lazy-load pythonnet + Syroot BFRES DLLs."""
     global _BFRES_BINDINGS
@@ -454,6 +732,8 @@ def _inject_bfbon_into_szs(szs_path: Path, bones_dir: Path):
     if not bones_dir.is_dir():
         raise FileNotFoundError(f"Bones folder not found: {bones_dir}")
 
+    import oead
+
     Bone, ResFile, Array, Byte, MemoryStream = _load_bfres_bindings(SCRIPT_DIR / "lib")
     from System import Console  # type: ignore
     from System.IO import TextWriter  # type: ignore
@@ -515,6 +795,7 @@ def _inject_bfbon_into_szs(szs_path: Path, bones_dir: Path):
     return True
 
 
+@functools.lru_cache(maxsize=4096)
 def extract_character_name(filename: str) -> str:
     # tc_Chara_<name>^l.png  -> <name>
     base = os.path.splitext(filename)[0]
@@ -543,9 +824,13 @@ class ScrollableFrame(ttk.Frame):
         self.inner.bind("<Configure>", self._on_inner)
         self.canvas.bind("<Configure>", self._on_canvas)
 
-        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel, add="+")
-        self.canvas.bind_all("<Button-4>", self._on_linux_scroll, add="+")
-        self.canvas.bind_all("<Button-5>", self._on_linux_scroll, add="+")
+        # bind (et non bind_all) : un handler global par instance ferait
+        # cascader chaque coup de molette dans tous les ScrollableFrame
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", self._on_linux_scroll)
+        self.canvas.bind("<Button-5>", self._on_linux_scroll)
+        # Sous Windows la molette suit le focus : le prendre sous le curseur
+        self.canvas.bind("<Enter>", lambda _e: self.canvas.focus_set())
 
     def _on_inner(self, _):
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
@@ -577,9 +862,13 @@ class MK8DXEditor(tk.Tk):
             for g in GROUP_DEFS
         }
         self.char_by_name = {}
+        self._lib_items = {}  # index de ligne -> ids des items canvas visibles
         self.mod_root = self._guess_mod_root()  # mods_characters_mk8dx folder
         self.group_overlay = None
         self.group_overlay_parent = None
+        self._overlay_cache = {}  # parent_idx -> (Toplevel, img_cells, txt_cells)
+        self._last_cell_state = {}  # idx -> dernier etat pousse vers le canvas
+        self._chars_scan_key = None  # (chemin, mtime) du dernier scan de characters/
         self.group_pinned = False  # opened by click
         self.group_hover_open = False  # opened temporarily during drag hover
 
@@ -587,10 +876,13 @@ class MK8DXEditor(tk.Tk):
         self.drag_char = None
         self.drag_source = None  # None | ("grid", idx) | ("group", parent_idx, gidx) | ("lib", None)
         self.drag_ghost = None
+        self._ghost_win = None  # Toplevel fantome persistant (cree au premier drag)
+        self._ghost_lbl = None
+        self._drag_motion_pending = False  # coalescence des <B1-Motion>
 
         self._build_ui()
         # prompt for mod root early
-        self.after(100, self.load_characters)
+        self.after(100, lambda: self.load_characters(skip_if_unchanged=True))
 
     # ---------------- UI ----------------
 
@@ -620,6 +912,11 @@ class MK8DXEditor(tk.Tk):
 
         self.lib = ScrollableFrame(lib_frame, width=320, height=560)
         self.lib.pack(fill="y", pady=(6, 0))
+        # Un seul binding sur le canvas : le hit-test se fait par indice de ligne
+        self.lib.canvas.bind("<ButtonPress-1>", self._on_lib_press)
+        # Culling : la zone visible est re-evaluee au scroll et au resize
+        self.lib.canvas.configure(yscrollcommand=self._on_lib_yscroll)
+        self.lib.canvas.bind("<Configure>", lambda e: self._update_library_viewport(), add="+")
 
         # Grid
         grid_frame = ttk.Frame(main, padding=(12, 0))
@@ -630,52 +927,52 @@ class MK8DXEditor(tk.Tk):
         self.grid_container = ttk.Frame(grid_frame)
         self.grid_container.pack(pady=(6, 0))
 
-        self.grid_img_cells = []
-        self.grid_text_cells = []
-        self.grid_badges = []  # for parent badge
+        # Appartenance en O(1) pendant le drag (overlay seulement, la grille
+        # elle-meme est resolue arithmetiquement)
+        self._group_label_ids: set[int] = set()
+
+        # Toute la grille est un seul canvas : 5 items par case au lieu de
+        # 3 widgets, et render_cell devient de simples itemconfigure
+        cell_w = ICON + 6
+        cell_h = ICON + TEXT_H + 6
+        self.grid_canvas = tk.Canvas(
+            self.grid_container,
+            width=GRID_COLS * cell_w,
+            height=GRID_ROWS * cell_h,
+            highlightthickness=0,
+            bg=self.cget("bg"),
+        )
+        self.grid_canvas.pack()
 
-        # Build as 2-row per grid row: images row then text row
+        self._grid_item_ids = []
         for i in range(GRID_COUNT):
             r, c = divmod(i, GRID_COLS)
-
-            # ---- Image cell container fixed 64x64
-            img_cell = ttk.Frame(self.grid_container, width=ICON, height=ICON)
-            img_cell.grid(row=r * 2, column=c, padx=3, pady=(3, 0))
-            img_cell.grid_propagate(False)
-            img_cell.idx = i
-
-            # Label inside fixed size via place (pixels)
-            img_label = tk.Label(img_cell, bd=1, relief="solid", bg=self.cget("bg"))
-            img_label.place(x=0, y=0, width=ICON, height=ICON)
-            img_label.idx = i  # attach idx for hit-testing
-
-            # Badge (bottom-right). Only used for group parent.
-            badge = tk.Label(
-                img_cell,
-                text="",
-                font=("Arial", 9, "bold"),
-                bg="white",
-                fg="black",
-                bd=0
+            x = c * cell_w + 3
+            y = r * cell_h + 3
+            rect = self.grid_canvas.create_rectangle(
+                x, y, x + ICON, y + ICON, outline="black", fill=self.cget("bg")
+            )
+            img = self.grid_canvas.create_image(x, y, anchor="nw")
+            txt = self.grid_canvas.create_text(
+                x + ICON // 2, y + ICON + TEXT_H // 2,
+                text="", font=("Arial", 8), width=ICON, justify="center",
+            )
+            # Badge (bas-droite), seulement pour les parents de groupe
+            badge_rect = self.grid_canvas.create_rectangle(
+                x + ICON - 16, y + ICON - 16, x + ICON, y + ICON,
+                fill="white", outline="", state="hidden",
+            )
+            badge_txt = self.grid_canvas.create_text(
+                x + ICON - 8, y + ICON - 8,
+                text="", font=("Arial", 9, "bold"), state="hidden",
+            )
+            self._grid_item_ids.append(
+                {"rect": rect, "img": img, "txt": txt,
+                 "badge_rect": badge_rect, "badge_txt": badge_txt}
             )
-            # place it; hide by default
-            badge.place_forget()
-
-            self.grid_badges.append(badge)
-
-            # Start drag from grid (or click parent)
-            img_label.bind("<ButtonPress-1>", self._on_grid_press)
-
-            # ---- Text cell fixed height, same width as icon
-            txt_cell = ttk.Frame(self.grid_container, width=ICON, height=TEXT_H)
-            txt_cell.grid(row=r * 2 + 1, column=c, padx=3, pady=(0, 3))
-            txt_cell.grid_propagate(False)
-
-            txt_label = tk.Label(txt_cell, text="", font=("Arial", 8), bg=self.cget("bg"))
-            txt_label.place(x=0, y=0, width=ICON, height=TEXT_H)
 
-            self.grid_img_cells.append(img_label)
-            self.grid_text_cells.append(txt_label)
+        # Un seul binding pour les 48 cases
+        self.grid_canvas.bind("<ButtonPress-1>", self._on_grid_press)
 
         # Global bindings (bind_all so drag from overlay works too)
         self.bind_all("<B1-Motion>", self._on_drag_motion)
@@ -724,13 +1021,107 @@ class MK8DXEditor(tk.Tk):
         self.mod_root = path
         return True
 
-    def load_characters(self):
+    def _load_icon_64(self, name: str, icon_path: Path):
+        """Icone 64x64, via le cache disque config/icon_cache.
+
+        La cle contient mtime+taille de la source : une icone modifiee est
+        re-generee et ses anciennes entrees purgees. Renvoie (cache_path, None)
+        sur cache chaud -- le PNG sera charge par l'importeur C de Tk sans
+        passer par PIL -- et (None, image_PIL) sur cache froid.
+        """
+        from PIL import Image
+
+        st = icon_path.stat()
+        cache_dir = Path(self.mod_root) / CONFIG_DIRNAME / "icon_cache"
+        cache_path = cache_dir / f"{name}.{st.st_mtime_ns}_{st.st_size}.png"
+        if cache_path.is_file():
+            return cache_path, None
+
+        img = Image.open(icon_path)
+        # draft : no-op pour les PNG, mais laisse le decodeur JPEG livrer un
+        # buffer deja reduit ; a 64x64 le bilineaire est indiscernable du LANCZOS
+        img.draft("RGB", (ICON * 2, ICON * 2))
+        img = img.convert("RGBA").resize((ICON, ICON), Image.Resampling.BILINEAR)
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            for stale in cache_dir.glob(f"{name}.*.png"):
+                stale.unlink(missing_ok=True)
+            img.save(cache_path, "PNG", optimize=False)
+        except OSError:
+            pass  # cache best-effort, l'icone reste utilisable
+        return None, img
+
+    LIB_ROW_H = ICON + 8  # hauteur d'une ligne de la bibliotheque
+
+    def _render_library(self):
+        """Dessine la bibliotheque sur le canvas : 2 items au lieu de 3 widgets par perso."""
+        canvas = self.lib.canvas
+        canvas.delete("char")
+        self._lib_items = {}
+        canvas.configure(scrollregion=(0, 0, 320, len(self.characters) * self.LIB_ROW_H + 8))
+        self._update_library_viewport()
+
+    def _update_library_viewport(self):
+        """Ne materialise que les lignes visibles ; les autres sont recyclees.
+
+        La memoire canvas reste en O(lignes visibles) quel que soit le nombre
+        de persos, et un scroll ne touche qu'une poignee d'items.
+        """
+        canvas = self.lib.canvas
+        row_h = self.LIB_ROW_H
+        top = canvas.canvasy(0)
+        height = canvas.winfo_height() or int(canvas.cget("height"))
+        i0 = max(0, int(top) // row_h)
+        i1 = min(len(self.characters), int(top + height) // row_h + 1)
+
+        items = self._lib_items
+        for i in [i for i in items if i < i0 or i >= i1]:
+            for item_id in items.pop(i):
+                canvas.delete(item_id)
+        for i in range(i0, i1):
+            if i in items:
+                continue
+            char = self.characters[i]
+            y = i * row_h + 4
+            ids = []
+            if char["image"] is not None:
+                ids.append(canvas.create_image(4, y, anchor="nw", image=char["image"], tags=("char",)))
+            ids.append(canvas.create_text(ICON + 12, y + ICON // 2, anchor="w",
+                                          text=char["name"], tags=("char",)))
+            items[i] = tuple(ids)
+
+    def _on_lib_yscroll(self, first, last):
+        self.lib.scroll.set(first, last)
+        self._update_library_viewport()
+
+    def _on_lib_press(self, event):
+        canvas = self.lib.canvas
+        i = int(canvas.canvasy(event.y) - 4) // self.LIB_ROW_H
+        if 0 <= i < len(self.characters):
+            self._start_drag(self.characters[i], ("lib", None))
+
+    def load_characters(self, skip_if_unchanged=False):
+        # Import differe : PIL n'est paye qu'a la premiere ouverture d'un dossier,
+        # pas quand le module est importe par les workers du pool de processus
+        from PIL import ImageTk
+
         if not self._ensure_mod_root():
             return
 
+        # Rescan evite uniquement pour l'appel automatique au demarrage
+        # (skip_if_unchanged) : le mtime de characters/ ne bouge pas quand un
+        # fichier est remplace a l'interieur d'un dossier de personnage, le
+        # bouton « Load characters » rescanne donc toujours
+        chars_root = Path(self.mod_root) / "characters"
+        try:
+            scan_key = (str(chars_root), os.stat(chars_root).st_mtime_ns)
+        except OSError:
+            scan_key = None
+        if skip_if_unchanged and scan_key is not None and scan_key == self._chars_scan_key and self.characters:
+            return
+        self._chars_scan_key = scan_key
+
         self.characters.clear()
-        for w in self.lib.inner.winfo_children():
-            w.destroy()
 
         self.mapping = {}
         self._load_mapping()
@@ -738,8 +1129,9 @@ class MK8DXEditor(tk.Tk):
         missing_icons = []
         self.char_by_name = {}
 
-        chars_root = Path(self.mod_root) / "characters"
-        subdirs = [p for p in chars_root.iterdir() if p.is_dir()]
+        # scandir : is_dir() vient du readdir, pas un stat supplementaire par entree
+        with os.scandir(chars_root) as dir_entries:
+            subdirs = [Path(e.path) for e in dir_entries if e.is_dir(follow_symlinks=False)]
 
         # build expected filename sets from mapping
         expected_by_dir = self._expected_files_by_dir()
@@ -757,6 +1149,7 @@ class MK8DXEditor(tk.Tk):
             ]
             return all(p.is_dir() for p in required)
 
+        entries = []  # (name, icon_path|None) dans l'ordre d'affichage
         for path in sorted(subdirs, key=lambda p: p.name.lower()):
             name = path.name
             if not folder_structure_ok(path):
@@ -764,11 +1157,18 @@ class MK8DXEditor(tk.Tk):
                 continue
 
             cmn_dir = path / "UI" / "cmn"
-            icon_path = None
-            for f in sorted(cmn_dir.iterdir()):
-                if f.is_file() and f.name.lower().startswith("tc_chara") and f.suffix.lower() in IMAGE_EXT:
-                    icon_path = f
-                    break
+            with os.scandir(cmn_dir) as cmn_entries:
+                icon_name = min(
+                    (
+                        e.name
+                        for e in cmn_entries
+                        if e.is_file()
+                        and e.name.lower().startswith("tc_chara")
+                        and os.path.splitext(e.name)[1].lower() in IMAGE_EXT
+                    ),
+                    default=None,
+                )
+            icon_path = cmn_dir / icon_name if icon_name else None
 
             # V?rrifie si au moins un fichier attendu par mapping existe
             def has_expected(expected_set, subdir):
@@ -783,13 +1183,39 @@ class MK8DXEditor(tk.Tk):
                 print(f"WARNING: Folder skipped (no expected mapping files): {name}")
                 continue
 
-            tkimg = None
-            if icon_path and icon_path.is_file():
+            entries.append((name, icon_path))
+
+        # Decodage + resize en parallele : le resampler C de PIL relache le GIL.
+        # Tk (PhotoImage, widgets) reste strictement sur le thread principal.
+        images = {}
+        to_decode = [(n, p) for n, p in entries if p is not None]
+        if to_decode:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=min(len(to_decode), os.cpu_count() or 1)) as ex:
+                futures = {n: ex.submit(self._load_icon_64, n, p) for n, p in to_decode}
+            for n, fut in futures.items():
                 try:
-                    img = Image.open(icon_path).convert("RGBA")
-                    img = img.resize((ICON, ICON), Image.Resampling.LANCZOS)
-                    tkimg = ImageTk.PhotoImage(img)
+                    images[n] = fut.result()
                 except Exception:
+                    images[n] = None
+
+        for name, icon_path in entries:
+            tkimg = None
+            if icon_path is not None:
+                res = images.get(name)
+                if res is not None:
+                    cache_file, img = res
+                    try:
+                        if img is None:
+                            # PNG 64x64 du cache : Tk le lit directement,
+                            # sans copie de pixels PIL -> Tk
+                            tkimg = tk.PhotoImage(file=str(cache_file), master=self)
+                        else:
+                            tkimg = ImageTk.PhotoImage(img)
+                    except Exception:
+                        missing_icons.append(name)
+                else:
                     missing_icons.append(name)
             else:
                 missing_icons.append(name)
@@ -798,19 +1224,7 @@ class MK8DXEditor(tk.Tk):
             self.characters.append(char)
             self.char_by_name[name] = char
 
-            row = ttk.Frame(self.lib.inner, padding=4)
-            row.pack(fill="x")
-
-            lbl_img = tk.Label(row, image=tkimg if tkimg else "")
-            if tkimg:
-                lbl_img.image = tkimg
-            lbl_img.pack(side="left", padx=(0, 6))
-
-            lbl_txt = ttk.Label(row, text=name)
-            lbl_txt.pack(side="left", padx=8)
-
-            for w in (row, lbl_img, lbl_txt):
-                w.bind("<ButtonPress-1>", lambda e, c=char: self._start_drag(c, ("lib", None)))
+        self._render_library()
 
         # start with empty placement; user associe manuellement
         self.clear_grid()
@@ -828,13 +1242,15 @@ class MK8DXEditor(tk.Tk):
         self.status.set(f"{msg} | Folder duplication check: ok")
 
     def _apply_fixed_layout(self):
+        # Fallback calcule une seule fois (premier perso avec image, sinon le
+        # premier tout court) : pick_default devient un simple get()
+        fallback = next(
+            (ch for ch in self.characters if ch.get("image") is not None),
+            self.characters[0] if self.characters else None,
+        )
+
         def pick_default(name_hint=None):
-            if name_hint and name_hint in self.char_by_name:
-                return self.char_by_name[name_hint]
-            for ch in self.characters:
-                if ch.get("image") is not None:
-                    return ch
-            return self.characters[0] if self.characters else None
+            return self.char_by_name.get(name_hint, fallback)
 
         # set grid cases to fixed mapping (ignore blocked)
         for idx in range(GRID_COUNT):
@@ -853,6 +1269,7 @@ class MK8DXEditor(tk.Tk):
 
         for i in range(GRID_COUNT):
             self.render_cell(i)
+        self.grid_container.update_idletasks()
         if self.group_overlay is not None:
             self._render_group_overlay()
 
@@ -871,9 +1288,26 @@ class MK8DXEditor(tk.Tk):
         if self.group_overlay is not None:
             return
 
-        parent_lbl = self.grid_img_cells[parent_idx]
-        x = parent_lbl.winfo_rootx()
-        y = parent_lbl.winfo_rooty()
+        r, c = divmod(parent_idx, GRID_COLS)
+        x = self.grid_canvas.winfo_rootx() + c * (ICON + 6) + 3
+        y = self.grid_canvas.winfo_rooty() + r * (ICON + TEXT_H + 6) + 3
+
+        # Overlay deja construit pour ce parent : le repositionner et le
+        # remontrer au lieu de reconstruire Toplevel + labels a chaque survol
+        cached = self._overlay_cache.get(parent_idx)
+        if cached is not None:
+            ov, img_cells, txt_cells = cached
+            ov.geometry(f"+{x}+{y}")
+            self.group_img_cells = img_cells
+            self.group_text_cells = txt_cells
+            self._group_label_ids = {id(lbl) for lbl in img_cells}
+            self.group_overlay_parent = parent_idx
+            self.group_overlay = ov
+            self.group_hover_open = not self.group_pinned
+            self._render_group_overlay()
+            ov.deiconify()
+            ov.lift()
+            return
 
         ov = tk.Toplevel(self)
         ov.overrideredirect(True)
@@ -889,6 +1323,7 @@ class MK8DXEditor(tk.Tk):
 
         self.group_img_cells = []
         self.group_text_cells = []
+        self._group_label_ids = set()
 
         size = self.groups[parent_idx]["size"]
         rows, cols = self._group_dims(size)
@@ -922,7 +1357,9 @@ class MK8DXEditor(tk.Tk):
 
             self.group_img_cells.append(img_label)
             self.group_text_cells.append(txt_label)
+            self._group_label_ids.add(id(img_label))
 
+        self._overlay_cache[parent_idx] = (ov, self.group_img_cells, self.group_text_cells)
         self.group_overlay_parent = parent_idx
         self.group_overlay = ov
         self.group_hover_open = not self.group_pinned
@@ -932,13 +1369,15 @@ class MK8DXEditor(tk.Tk):
         if self.group_overlay is None:
             return
         try:
-            self.group_overlay.destroy()
+            # withdraw et non destroy : l'overlay est recycle au prochain survol
+            self.group_overlay.withdraw()
         except Exception:
             pass
         self.group_overlay = None
         self.group_overlay_parent = None
         self.group_img_cells = []
         self.group_text_cells = []
+        self._group_label_ids = set()
         self.group_hover_open = False
 
     def _render_group_overlay(self):
@@ -964,26 +1403,27 @@ class MK8DXEditor(tk.Tk):
         self.drag_char = char
         self.drag_source = source
 
-        if self.drag_ghost:
-            try:
-                self.drag_ghost.destroy()
-            except Exception:
-                pass
+        # Le Toplevel fantome est cree une fois puis recycle : creer une
+        # fenetre topmost/overrideredirect coute des allers-retours au WM
+        if self._ghost_win is None:
+            self._ghost_win = tk.Toplevel(self)
+            self._ghost_win.overrideredirect(True)
+            self._ghost_win.attributes("-topmost", True)
+            self._ghost_lbl = tk.Label(self._ghost_win, bd=0)
+            self._ghost_lbl.pack()
 
-        self.drag_ghost = tk.Toplevel(self)
-        self.drag_ghost.overrideredirect(True)
-        self.drag_ghost.attributes("-topmost", True)
-
-        lbl = tk.Label(self.drag_ghost, image=char["image"], bd=0)
-        lbl.pack()
-        lbl.image = char["image"]
+        self._ghost_lbl.config(image=char["image"] if char["image"] else "")
+        self._ghost_lbl.image = char["image"]
+        self.drag_ghost = self._ghost_win
 
         self._move_ghost()
+        self._ghost_win.deiconify()
+        self._ghost_win.lift()
 
     def _on_grid_press(self, event):
-        idx = event.widget.idx
+        idx = self._grid_cell_at(event.x, event.y)
 
-        if idx in BLOCKED_INDICES:
+        if idx is None or idx in BLOCKED_INDICES:
             return
 
         # Clicking parent toggles pinned overlay (if not dragging something)
@@ -1021,19 +1461,30 @@ class MK8DXEditor(tk.Tk):
         self.drag_ghost.geometry(f"+{x}+{y}")
 
     def _on_drag_motion(self, _):
-        if self.drag_char:
-            self._move_ghost()
-
-            # hover-open group overlay when dragging over a parent cell
-            parent_idx = self._parent_under_pointer()
-            if parent_idx is not None and not self.group_pinned:
-                if self.group_overlay is None or self.group_overlay_parent != parent_idx:
-                    self.group_hover_open = True
-                    self._show_group_overlay(parent_idx)
-            else:
-                if self.group_overlay is not None and not self.group_pinned and self.group_hover_open:
-                    if not self._pointer_over_overlay():
-                        self._hide_group_overlay()
+        # <B1-Motion> peut tirer a 100+ evenements/s : on ne garde que la
+        # derniere position et on traite au plus une fois par cycle idle
+        if not self.drag_char:
+            return
+        if not self._drag_motion_pending:
+            self._drag_motion_pending = True
+            self.after_idle(self._flush_drag_motion)
+
+    def _flush_drag_motion(self):
+        self._drag_motion_pending = False
+        if not self.drag_char:
+            return
+        self._move_ghost()
+
+        # hover-open group overlay when dragging over a parent cell
+        parent_idx = self._parent_under_pointer()
+        if parent_idx is not None and not self.group_pinned:
+            if self.group_overlay is None or self.group_overlay_parent != parent_idx:
+                self.group_hover_open = True
+                self._show_group_overlay(parent_idx)
+        else:
+            if self.group_overlay is not None and not self.group_pinned and self.group_hover_open:
+                if not self._pointer_over_overlay():
+                    self._hide_group_overlay()
 
     def _on_drag_release(self, _):
         if not self.drag_char:
@@ -1064,20 +1515,15 @@ class MK8DXEditor(tk.Tk):
         if self.group_overlay is not None:
             t = target
             while t is not None:
-                if hasattr(t, "gidx") and t in getattr(self, "group_img_cells", []):
+                if hasattr(t, "gidx") and id(t) in self._group_label_ids:
                     target_gi = t.gidx
                     target_parent_idx = getattr(t, "parent_idx", self.group_overlay_parent)
                     break
                 t = t.master
 
         # ---- Detect grid target ----
-        target_idx = None
-        t = target
-        while t is not None:
-            if hasattr(t, "idx") and t in self.grid_img_cells:
-                target_idx = t.idx
-                break
-            t = t.master
+        # La grille est un canvas : resolution purement arithmetique
+        target_idx = self._grid_index_at_pointer(wx, wy)
 
         # If drop on group subcell
         if target_gi is not None and target_parent_idx is not None:
@@ -1092,10 +1538,10 @@ class MK8DXEditor(tk.Tk):
             if self.drag_source and self.drag_source[0] in ("grid", "group"):
                 self._remove_from_source()
 
-        # Cleanup ghost
+        # Cacher le ghost (recycle au prochain drag)
         if self.drag_ghost:
             try:
-                self.drag_ghost.destroy()
+                self.drag_ghost.withdraw()
             except Exception:
                 pass
 
@@ -1192,17 +1638,37 @@ class MK8DXEditor(tk.Tk):
                 self._render_group_overlay()
             self.render_cell(parent_idx)
 
+    def _grid_cell_at(self, cx, cy):
+        """Indice de la case image sous (cx, cy) en coordonnees canvas.
+
+        La grille est un reseau regulier de cellules 64x64 : deux divmod
+        suffisent. Renvoie None hors de la zone image.
+        """
+        if cx < 0 or cy < 0:
+            return None
+        col, rx = divmod(int(cx), ICON + 6)           # padx=3 de chaque cote
+        row, ry = divmod(int(cy), ICON + TEXT_H + 6)  # image + texte + marges
+        if col >= GRID_COLS or row >= GRID_ROWS:
+            return None
+        # Ne compter que la zone image (pas le texte ni les marges)
+        if not (3 <= rx < 3 + ICON and 3 <= ry < 3 + ICON):
+            return None
+        return int(row * GRID_COLS + col)
+
+    def _grid_index_at_pointer(self, wx, wy):
+        """Comme _grid_cell_at mais en coordonnees ecran (drag en cours)."""
+        try:
+            ox = self.grid_canvas.winfo_rootx()
+            oy = self.grid_canvas.winfo_rooty()
+        except Exception:
+            return None
+        return self._grid_cell_at(wx - ox, wy - oy)
+
     def _parent_under_pointer(self):
         wx, wy = self.winfo_pointerx(), self.winfo_pointery()
-        target = self.winfo_containing(wx, wy)
-
-        t = target
-        while t is not None:
-            if hasattr(t, "idx") and t in self.grid_img_cells:
-                idx = t.idx
-                if idx in self.groups:
-                    return idx
-            t = getattr(t, "master", None)
+        idx = self._grid_index_at_pointer(wx, wy)
+        if idx is not None and idx in self.groups:
+            return idx
         return None
 
     def _pointer_over_overlay(self) -> bool:
@@ -1226,8 +1692,11 @@ class MK8DXEditor(tk.Tk):
             return True
         return self._parent_under_pointer() == parent_idx
 
-    def _cell_label_text(self, fixed_name, char):
-        current = char["name"] if char else ""
+    @staticmethod
+    @functools.lru_cache(maxsize=2048)
+    def _format_cell_label(fixed_name, current):
+        # Memoize : les combinaisons (case fixe, perso) sont peu nombreuses et
+        # reviennent a chaque render_cell
         if fixed_name and current:
             if fixed_name == current:
                 return fixed_name
@@ -1236,6 +1705,9 @@ class MK8DXEditor(tk.Tk):
             return f"{fixed_name}\n-"
         return current or ""
 
+    def _cell_label_text(self, fixed_name, char):
+        return self._format_cell_label(fixed_name, char["name"] if char else "")
+
     def _on_global_click(self, event):
         # If pinned overlay open, click outside parent+overlay => close
         if self.group_overlay is None or not self.group_pinned:
@@ -1253,11 +1725,8 @@ class MK8DXEditor(tk.Tk):
 
         # click on parent?
         parent_idx = self.group_overlay_parent
-        t = target
-        while t is not None:
-            if parent_idx is not None and hasattr(t, "idx") and t in self.grid_img_cells and t.idx == parent_idx:
-                return
-            t = t.master
+        if parent_idx is not None and self._grid_index_at_pointer(wx, wy) == parent_idx:
+            return
 
         # else close
         self.group_pinned = False
@@ -1266,14 +1735,20 @@ class MK8DXEditor(tk.Tk):
     # ---------------- Grid rendering ----------------
 
     def render_cell(self, idx):
-        img_lbl = self.grid_img_cells[idx]
-        txt_lbl = self.grid_text_cells[idx]
+        canvas = self.grid_canvas
+        items = self._grid_item_ids[idx]
+        bg = self.cget("bg")
 
         if idx in BLOCKED_INDICES:
-            img_lbl.config(image="", bg="black")
-            img_lbl.image = None
-            txt_lbl.config(text="", bg="black")
-            self.grid_badges[idx].place_forget()
+            state = ("blocked",)
+            if self._last_cell_state.get(idx) == state:
+                return
+            self._last_cell_state[idx] = state
+            canvas.itemconfigure(items["rect"], fill="black")
+            canvas.itemconfigure(items["img"], image="")
+            canvas.itemconfigure(items["txt"], text="")
+            canvas.itemconfigure(items["badge_rect"], state="hidden")
+            canvas.itemconfigure(items["badge_txt"], state="hidden")
             return
 
         # Special rendering for group parent
@@ -1281,42 +1756,54 @@ class MK8DXEditor(tk.Tk):
             # Parent shows first subcase (slot 0) at rest
             slots = self.groups[idx]["slots"]
             ch = slots[0] if slots else None
-            if ch is None:
-                img_lbl.config(image="", bg=self.cget("bg"))
-                img_lbl.image = None
-                txt_lbl.config(text=self._cell_label_text(CASE_NAME_BY_INDEX.get(idx), None), bg=self.cget("bg"))
-            else:
-                img_lbl.config(image=ch["image"], bg="white")
-                img_lbl.image = ch["image"]
-                txt_lbl.config(text=self._cell_label_text(CASE_NAME_BY_INDEX.get(idx), ch), bg=self.cget("bg"))
+            img = (ch["image"] or "") if ch is not None else ""
+            txt = self._cell_label_text(CASE_NAME_BY_INDEX.get(idx), ch)
+            badge = str(self.groups[idx]["size"])
+            # Ne repasse par Tk que si quelque chose a visuellement change
+            state = ("parent", img, txt, badge)
+            if self._last_cell_state.get(idx) == state:
+                return
+            self._last_cell_state[idx] = state
+            canvas.itemconfigure(items["rect"], fill=bg if ch is None else "white")
+            canvas.itemconfigure(items["img"], image=img)
+            canvas.itemconfigure(items["txt"], text=txt)
 
             # badge "9" bottom-right
-            badge = self.grid_badges[idx]
-            badge.config(text=str(self.groups[idx]["size"]))
-            # small badge with a bit of padding
-            badge.place(x=ICON - 16, y=ICON - 16, width=16, height=16)
+            canvas.itemconfigure(items["badge_rect"], state="normal")
+            canvas.itemconfigure(items["badge_txt"], text=badge, state="normal")
             return
 
         # Normal cells
         char = self.grid[idx]
-        if char is None:
-            img_lbl.config(image="", bg=self.cget("bg"))
-            img_lbl.image = None
-            txt_lbl.config(text=self._cell_label_text(CASE_NAME_BY_INDEX.get(idx), None), bg=self.cget("bg"))
-        else:
-            img_lbl.config(image=char["image"], bg="white")
-            img_lbl.image = char["image"]
-            txt_lbl.config(text=self._cell_label_text(CASE_NAME_BY_INDEX.get(idx), char), bg=self.cget("bg"))
+        img = (char["image"] or "") if char is not None else ""
+        txt = self._cell_label_text(CASE_NAME_BY_INDEX.get(idx), char)
+        state = ("cell", img, txt)
+        if self._last_cell_state.get(idx) == state:
+            return
+        self._last_cell_state[idx] = state
+        canvas.itemconfigure(items["rect"], fill=bg if char is None else "white")
+        canvas.itemconfigure(items["img"], image=img)
+        canvas.itemconfigure(items["txt"], text=txt)
 
         # hide badge for non-parent
-        self.grid_badges[idx].place_forget()
+        canvas.itemconfigure(items["badge_rect"], state="hidden")
+        canvas.itemconfigure(items["badge_txt"], state="hidden")
+
+    def render_all(self):
+        """Redraw the whole grid with a single relayout at the end.
+
+        render_cell ne touche que les cellules dont l'etat a change, donc le
+        cout d'un rafraichissement global est proportionnel aux changements.
+        """
+        for i in range(GRID_COUNT):
+            self.render_cell(i)
+        self.grid_container.update_idletasks()
 
     def clear_grid(self):
         self.grid = [None] * GRID_COUNT
         for g in self.groups.values():
             g["slots"] = [None] * g["size"]
-        for i in range(GRID_COUNT):
-            self.render_cell(i)
+        self.render_all()
         if self.group_overlay is not None:
             self._render_group_overlay()
 
@@ -1325,14 +1812,14 @@ class MK8DXEditor(tk.Tk):
             messagebox.showerror("Error", "Load characters first.")
             return
 
-        used_paths = set()
+        # Pioche melangee : un pop O(1) par case, au lieu de refiltrer toute
+        # la liste des personnages a chaque tirage
+        unused = list(self.characters)
+        random.shuffle(unused)
 
         def pick_for_slot():
-            available = [ch for ch in self.characters if ch["path"] not in used_paths]
-            if available:
-                pick = random.choice(available)
-                used_paths.add(pick["path"])
-                return pick
+            if unused:
+                return unused.pop()
             # no unique left -> take any
             return random.choice(self.characters)
 
@@ -1344,14 +1831,13 @@ class MK8DXEditor(tk.Tk):
             if i in parent_indices or i in blocked_indices:
                 continue
             self.grid[i] = pick_for_slot()
-            self.render_cell(i)
 
         # randomize group slots too
         for parent_idx, group in self.groups.items():
             for gi in range(group["size"]):
                 group["slots"][gi] = pick_for_slot()
-            self.render_cell(parent_idx)
 
+        self.render_all()
         if self.group_overlay is not None:
             self._render_group_overlay()
 
@@ -1359,10 +1845,7 @@ class MK8DXEditor(tk.Tk):
     # ---------------- Files copy ----------------
 
     def _all_fixed_names(self):
-        names = set(CASE_NAME_BY_INDEX.values())
-        for lst in GROUP_SLOT_NAMES.values():
-            names.update(lst)
-        return names
+        return _ALL_FIXED_NAMES
 
     def _mapping_path(self):
         if not self.mod_root:
@@ -1371,20 +1854,14 @@ class MK8DXEditor(tk.Tk):
         return _config_path(base, MAPPING_FILENAME)
 
     def _default_files_for(self, name):
-        return {
-            "Driver": f"Driver/{name}.szs",
-            "Audio/DriverMenu": f"Audio/DriverMenu/MenuDriver_{name}.bars",
-            "Audio/Driver": f"Audio/Driver/Driver_{name}.bars",
-            "ui": f"tc_Chara_{name}^l.png",
-            "ui_ed": f"tc_edChara_{name}^l.png",
-            "ui_map": f"tc_MapChara_{name}^l.png",
-        }
+        base = _DEFAULT_FILES_BY_NAME.get(name)
+        if base is None:
+            return _default_files_for_name(name)
+        return dict(base)  # copie : les entrees du mapping sont mutables
 
     def _build_default_mapping(self):
-        mapping = {}
-        for name in sorted(self._all_fixed_names()):
-            mapping[name] = self._default_files_for(name)
-        return mapping
+        # _DEFAULT_FILES_BY_NAME est deja en ordre trie
+        return {name: dict(files) for name, files in _DEFAULT_FILES_BY_NAME.items()}
 
     def _expected_files_by_dir(self) -> dict[str, set[str]]:
         """Return expected file names grouped by relative directory, based on the mapping."""
@@ -1461,8 +1938,7 @@ class MK8DXEditor(tk.Tk):
         path = self._mapping_path()
         if path and path.is_file():
             try:
-                with path.open("r", encoding="utf-8") as f:
-                    raw = json.load(f)
+                raw = _json_loads(path.read_bytes())
                 if isinstance(raw, dict):
                     for k, v in raw.items():
                         self.mapping[k] = self._normalize_mapping_entry(k, v)
@@ -1477,14 +1953,19 @@ class MK8DXEditor(tk.Tk):
             return
         try:
             path.parent.mkdir(parents=True, exist_ok=True)
-            with path.open("w", encoding="utf-8") as f:
-                json.dump(self.mapping, f, indent=2, ensure_ascii=False)
+            # dumps + une seule ecriture : json.dump emet un write par token
+            path.write_text(
+                json.dumps(self.mapping, indent=2, ensure_ascii=False), encoding="utf-8"
+            )
         except Exception:
             pass
 
     # -------- duplication (character_copy) -------
     def _dup_list_files(self, folder: Path) -> list[str]:
-        return sorted([p.name for p in folder.iterdir() if p.is_file()])
+        # scandir : le type vient du readdir, pas un stat par entree comme
+        # iterdir() + is_file()
+        with os.scandir(folder) as entries:
+            return sorted(e.name for e in entries if e.is_file(follow_symlinks=False))
 
     def _confirm_missing_copy(self, title: str, summary: str, actions: list[dict]) -> list[dict]:
         """
@@ -1591,6 +2072,8 @@ class MK8DXEditor(tk.Tk):
             return
 
         missing_entries = []
+        # Un seul tri pour tous les enfants, au lieu d'un sorted() par dossier
+        expected_sorted = sorted(expected_files)
 
         for child in child_dirs:
             folder = child / relative
@@ -1598,34 +2081,39 @@ class MK8DXEditor(tk.Tk):
                 lines.append(f"[{relative}] {child.name}: missing subfolder, skipped")
                 continue
             files = self._dup_list_files(folder)
-            missing = expected_files.difference(files)
-            if not missing:
+            present = set(files)
+            missing_sorted = [n for n in expected_sorted if n not in present]
+            if not missing_sorted:
                 continue
             templates = {}
+            fallback = files[0] if files else None
+            ui_prefixes = ("tc_edChara_", "tc_MapChara_", "tc_Chara_")
+            first_by_prefix: dict[str, str] = {}
+            if relative == "UI/cmn":
+                # Un seul passage sur files : premier modele de chaque prefixe,
+                # au lieu d'un scan lineaire par fichier manquant
+                for name in files:
+                    for prefix in ui_prefixes:
+                        if name.startswith(prefix):
+                            first_by_prefix.setdefault(prefix, name)
+                            break
 
             def pick_ui_template(target: str):
                 # Try to keep tc_Chara / tc_edChara / tc_MapChara variants aligned.
-                if target.startswith("tc_edChara_"):
-                    prefix = "tc_edChara_"
-                elif target.startswith("tc_MapChara_"):
-                    prefix = "tc_MapChara_"
-                elif target.startswith("tc_Chara_"):
-                    prefix = "tc_Chara_"
-                else:
-                    prefix = None
-                if prefix:
-                    for name in files:
-                        if name.startswith(prefix):
-                            return name
-                return files[0] if files else None
-
-            for name in sorted(missing):
+                for prefix in ui_prefixes:
+                    if target.startswith(prefix):
+                        return first_by_prefix.get(prefix, fallback)
+                return fallback
+
+            # Modeles calcules ici une seule fois : la phase de copie
+            # consomme l'entree telle quelle, sans re-lister ni re-trier
+            for name in missing_sorted:
                 if relative == "UI/cmn":
                     templates[name] = pick_ui_template(name)
                 else:
                     templates[name] = files[0] if files else None
 
-            missing_entries.append((child, folder, missing, templates))
+            missing_entries.append((child, folder, missing_sorted, templates))
 
         if not missing_entries:
             lines.append(f"[{relative}] no missing files.")
@@ -1645,6 +2133,7 @@ class MK8DXEditor(tk.Tk):
             return actions
 
         missing_entries = []
+        expected_sorted = sorted(expected_files)
 
         for child in child_dirs:
             folder = child / relative
@@ -1652,7 +2141,8 @@ class MK8DXEditor(tk.Tk):
                 lines.append(f"[{relative}] {child.name}: missing subfolder, skipped")
                 continue
             files = self._dup_list_files(folder)
-            missing = expected_files.difference(files)
+            present = set(files)
+            missing = [n for n in expected_sorted if n not in present]
             if not missing:
                 continue
             existing_bars = [f for f in files if f.lower().endswith(".bars")]
@@ -1673,7 +2163,7 @@ class MK8DXEditor(tk.Tk):
                 lines.append(f"[{relative}] {child.name}: no source .bars, nothing patched.")
                 continue
             src_path = folder / src_name
-            for name in sorted(missing):
+            for name in missing:  # deja trie lors de la collecte
                 dest = folder / name
                 label = f"{child.name}/{relative}/{name}"
                 actions.append({"kind": "bars", "src": src_path, "dst": dest, "label": label, "relative": relative})
@@ -1711,7 +2201,7 @@ class MK8DXEditor(tk.Tk):
                 if not templates:
                     lines.append(f"[{relative}] {child.name}: no source file, nothing copied.")
                     continue
-                for name in sorted(missing):
+                for name in missing:  # deja trie lors de la collecte
                     template_name = templates.get(name)
                     if not template_name:
                         lines.append(f"[{relative}] {child.name}: no template for {name}, skipped.")
@@ -1750,8 +2240,11 @@ class MK8DXEditor(tk.Tk):
         copied_count = 0
         patched_count = 0
         bfwav_groups = None
-        bars_cache: dict[str, Bars] = {}
+        bars_cache: dict[str, tuple[int, Bars]] = {}
         injected_sources: set[Path] = set()
+        # Le meme modele part vers N destinations : lu une seule fois,
+        # puis ecrit depuis la memoire (plus d'open+stat de la source par copie)
+        template_blobs: dict[str, bytes] = {}
         actions_start = overall_start
         total_actions = len(selected_actions)
         for i, action in enumerate(selected_actions, 1):
@@ -1782,7 +2275,14 @@ class MK8DXEditor(tk.Tk):
                     lines.append(f"[ERROR] Failed to inject bones into source {src}: {e}")
                     return "\n".join(lines).rstrip()
             os.makedirs(dst.parent, exist_ok=True)
-            shutil.copy2(src, dst)
+            # Sur FS copy-on-write, le clone evite meme l'ecriture du blob
+            if not _try_reflink(src, dst):
+                blob = template_blobs.get(str(src))
+                if blob is None:
+                    # apres l'injection d'os eventuelle, le contenu de src est fige
+                    blob = Path(src).read_bytes()
+                    template_blobs[str(src)] = blob
+                Path(dst).write_bytes(blob)
             copied_count += 1
             if should_log:
                 elapsed = time.perf_counter() - action_start
@@ -1821,7 +2321,7 @@ class MK8DXEditor(tk.Tk):
             found = False
             for candidate in candidates:
                 if candidate.is_file():
-                    shutil.copy2(candidate, dst)
+                    _fast_copyfile(candidate, dst)
                     found = True
                     break
             if not found:
@@ -1901,7 +2401,7 @@ class MK8DXEditor(tk.Tk):
             if skip_existing_shared and dst_shared.exists():
                 continue
             if src_shared.is_file():
-                shutil.copy2(src_shared, dst_shared)
+                _fast_copyfile(src_shared, dst_shared)
                 copied += 1
             else:
                 if not dst_shared.exists():
@@ -1914,6 +2414,32 @@ class MK8DXEditor(tk.Tk):
             "Rosetta.szs": "RosettaSuit.szs",
         }
 
+        # Les destinations se partagent 4 sous-dossiers : on les cree une fois
+        # au lieu d'un mkdir (stat sur toute la profondeur) par fichier copie
+        created_dirs = {ui_common_dst}
+        for rel_dir in ("Driver", "Audio/DriverMenu", "Audio/Driver"):
+            d = dst_root / rel_dir
+            d.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(d)
+
+        # Phase 1 : resoudre toutes les paires (src, dst) sans rien copier.
+        # Un scandir par dossier source remplace un stat par fichier : les
+        # personnages partagent 4 sous-dossiers, la liste est donc reutilisee.
+        dir_listing_cache: dict[str, set[str]] = {}
+
+        def src_exists(src: Path) -> bool:
+            key = str(src.parent)
+            listing = dir_listing_cache.get(key)
+            if listing is None:
+                try:
+                    with os.scandir(src.parent) as entries:
+                        listing = {e.name for e in entries if e.is_file(follow_symlinks=False)}
+                except OSError:
+                    listing = set()
+                dir_listing_cache[key] = listing
+            return src.name in listing
+
+        jobs: list[tuple[Path, Path]] = []
         for fixed_name, folder_name in assignments:
             base = Path(self.mod_root) / "characters" / folder_name
             files = self.mapping.get(fixed_name, self._default_files_for(fixed_name))
@@ -1933,21 +2459,30 @@ class MK8DXEditor(tk.Tk):
                     continue
                 rel_path = Path(rel)
                 src = base / rel_path
-                if not src.is_file():
+                if not src_exists(src):
                     missing.append(f"{folder_name}/{rel}")
                     continue
                 dst = dst_root / rel_path
-                dst.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(src, dst)
-                copied += 1
+                if dst.parent not in created_dirs:
+                    dst.parent.mkdir(parents=True, exist_ok=True)
+                    created_dirs.add(dst.parent)
+                jobs.append((src, dst))
                 rel_parts = rel_path.parts
                 if rel_parts and rel_parts[0].lower() == "driver" and dst.suffix.lower() == ".szs":
-                    base_name = dst.name
-                    suit_name = suit_variants.get(base_name)
+                    suit_name = suit_variants.get(dst.name)
                     if suit_name:
-                        suit_dst = dst.with_name(suit_name)
-                        shutil.copy2(dst, suit_dst)
-                        copied += 1
+                        # meme contenu que dst : copie directe depuis la source,
+                        # les deux jobs deviennent independants
+                        jobs.append((src, dst.with_name(suit_name)))
+
+        # Phase 2 : copies en parallele -- chaque copie est bornee par la
+        # latence E/S (le GIL est relache), les threads les recouvrent
+        if jobs:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=min(16, len(jobs))) as ex:
+                list(ex.map(lambda pair: _fast_copyfile(*pair), jobs))
+            copied += len(jobs)
 
         msg = f"Copied {copied} file(s) to {target_label}."
         if missing:
@@ -2007,14 +2542,15 @@ class MK8DXEditor(tk.Tk):
             group_out[parent_idx] = slots_copy
 
         pool = [c for c in self.characters if c["path"] not in used]
+        # Melange une fois puis pop() en fin de liste : O(1) par tirage,
+        # la ou choice + remove rescannait la liste a chaque case vide
+        random.shuffle(pool)
 
         def fill_if_none(ch):
-            nonlocal pool
             if ch is not None:
                 return ch
             if pool:
-                pick = random.choice(pool)
-                pool.remove(pick)
+                pick = pool.pop()
                 used.add(pick["path"])
                 return pick
             return random.choice(self.characters)
@@ -2046,8 +2582,9 @@ class MK8DXEditor(tk.Tk):
 
         path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("Preset", "*.json")])
         if path:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            Path(path).write_text(
+                json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8"
+            )
 
     def import_preset(self):
         path = filedialog.askopenfilename(filetypes=[("Preset", "*.json")])
@@ -2057,27 +2594,28 @@ class MK8DXEditor(tk.Tk):
             messagebox.showerror("Error", "Load characters first (to resolve files).")
             return
 
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _json_loads(Path(path).read_bytes())
 
         grid_files = data.get("grid_files") or data.get("grid")
         if not isinstance(grid_files, list) or len(grid_files) != GRID_COUNT:
             messagebox.showerror("Error", f"Invalid preset: expected {GRID_COUNT} entries.")
             return
 
-        mapping_file = {c["file"]: c for c in self.characters}
-        mapping_name = {c["name"]: c for c in self.characters}
+        # Un seul dict fusionne (le nom prime sur le fichier) : une seule
+        # recherche par cle au lieu de deux .get en cascade
+        merged = {c["file"]: c for c in self.characters}
+        merged.update((c["name"], c) for c in self.characters)
+        resolve = merged.get
 
         def resolve_char(key):
-            if key is None:
-                return None
-            return mapping_name.get(key) or mapping_file.get(key)
+            return None if key is None else resolve(key)
 
         missing = 0
+        groups = self.groups
 
         for i, entry in enumerate(grid_files):
-            if i in self.groups:
-                expected = self.groups[i]["size"]
+            if i in groups:
+                expected = groups[i]["size"]
                 # entry may be dict group, or old string
                 if isinstance(entry, dict) and entry.get("type") == "group":
                     slots = entry.get("slots", [])
@@ -2088,7 +2626,7 @@ class MK8DXEditor(tk.Tk):
                         if fname and ch is None:
                             missing += 1
                         resolved.append(ch)
-                    self.groups[i]["slots"] = resolved
+                    groups[i]["slots"] = resolved
                 else:
                     # old format: a filename in parent cell -> put it in slot0
                     fname = entry
@@ -2098,7 +2636,7 @@ class MK8DXEditor(tk.Tk):
                     resolved = [None] * expected
                     if expected:
                         resolved[0] = ch
-                    self.groups[i]["slots"] = resolved
+                    groups[i]["slots"] = resolved
 
                 # render parent after
                 continue
@@ -2110,8 +2648,7 @@ class MK8DXEditor(tk.Tk):
                 missing += 1
             self.grid[i] = ch
 
-        for i in range(GRID_COUNT):
-            self.render_cell(i)
+        self.render_all()
 
         if self.group_overlay is not None:
             self._render_group_overlay()